@@ -2,7 +2,7 @@
 Order model for buy/sell water orders
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, Enum, ForeignKey, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -21,7 +21,19 @@ class OrderStatus(str, enum.Enum):
 
 class Order(Base):
     __tablename__ = "orders"
-    
+
+    # Covering index for the matching engine's book queries (best bid/ask
+    # and the candidate-pair join), plus a partial index over open orders
+    __table_args__ = (
+        Index("ix_orders_book", "order_type", "basin", "status", "price_per_af", "created_at"),
+        Index(
+            "ix_orders_open", "order_type", "basin", "price_per_af",
+            postgresql_where=text("status IN ('OPEN', 'PARTIALLY_FILLED')"),
+            sqlite_where=text("status IN ('OPEN', 'PARTIALLY_FILLED')"),
+        ),
+    )
+
+
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     
@@ -0,0 +1,64 @@
+"""
+Shared great-circle distance kernels.
+
+Both the spatial data service and the GSP compliance stage previously
+carried their own copy of the haversine formula. The kernels live here
+once, in scalar and whole-array form, and are JIT-compiled when numba
+is installed (the same optional treatment the matching engine gives its
+inner loop). The plain-Python/NumPy definitions are the fallback.
+"""
+
+import math
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+_EARTH_RADIUS_MI = 3958.8
+
+
+def haversine_mi(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in miles between two points."""
+    dlat = math.radians(lat2 - lat1)
+    dlon = math.radians(lon2 - lon1)
+    a = (math.sin(dlat / 2) ** 2 +
+         math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) *
+         math.sin(dlon / 2) ** 2)
+    return _EARTH_RADIUS_MI * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def haversine_mi_arr(lat: float, lng: float,
+                     lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """Great-circle distances in miles from one point to arrays of points."""
+    lat0 = math.radians(lat)
+    lats_rad = np.radians(lats)
+    dlat = lats_rad - lat0
+    dlon = np.radians(lngs - lng)
+    a = (np.sin(dlat / 2) ** 2 +
+         math.cos(lat0) * np.cos(lats_rad) * np.sin(dlon / 2) ** 2)
+    return _EARTH_RADIUS_MI * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def haversine_mi_arr_pre(lat: float, lng: float,
+                         lats_rad: np.ndarray, cos_lats: np.ndarray,
+                         lngs: np.ndarray) -> np.ndarray:
+    """
+    Like haversine_mi_arr, but for callers that precompute the point
+    radians and cosines once at load time — the per-query trig reduces to
+    the sines of the half-deltas.
+    """
+    lat0 = math.radians(lat)
+    dlat = lats_rad - lat0
+    dlon = np.radians(lngs - lng)
+    a = (np.sin(dlat / 2) ** 2 +
+         math.cos(lat0) * cos_lats * np.sin(dlon / 2) ** 2)
+    return _EARTH_RADIUS_MI * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+if numba is not None:
+    haversine_mi = numba.njit(cache=True)(haversine_mi)
+    haversine_mi_arr = numba.njit(cache=True)(haversine_mi_arr)
+    haversine_mi_arr_pre = numba.njit(cache=True)(haversine_mi_arr_pre)
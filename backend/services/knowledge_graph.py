@@ -8,11 +8,33 @@ Entities and relationships were extracted using Gemini LLM
 and stored in a NetworkX directed graph.
 """
 
+import functools
+import heapq
 import json
 import networkx as nx
 from typing import List, Dict, Any, Optional, Set, Tuple
 from pathlib import Path
 from collections import Counter
+from operator import itemgetter
+
+
+@functools.cache
+def _resolve_kg_path() -> Optional[Path]:
+    """
+    Resolve the extracted knowledge-graph JSON once per process.
+    Prefer v3 (two-tree compliance) > v2 (layered) > v1 (hubbed),
+    then the legacy backend/data location.
+    """
+    base = Path(__file__).parent.parent.parent / "data" / "policies"
+    for version in ["knowledge_graph_v3.json", "knowledge_graph_v2.json", "knowledge_graph_data.json"]:
+        candidate = base / version
+        if candidate.exists():
+            return candidate
+
+    alt_path = Path(__file__).parent.parent / "data" / "policies" / "knowledge_graph_data.json"
+    if alt_path.exists():
+        return alt_path
+    return None
 
 
 class SGMAKnowledgeGraph:
@@ -36,6 +58,18 @@ class SGMAKnowledgeGraph:
         self._entity_index: Dict[str, Dict] = {}       # id -> entity data
         self._type_index: Dict[str, List[str]] = {}     # type -> [entity ids]
         self._name_index: Dict[str, str] = {}           # lowercase name -> entity id
+        self._node_type_counts: Counter = Counter()     # type -> node count
+        self._edge_reltype_counts: Counter = Counter()  # relation -> edge count
+        # (eid, type, lowercased name, long keywords) for Rule/Requirement/GSA,
+        # precomputed so compliance checks scan once without re-tokenizing
+        self._compliance_match_records: List[Tuple[str, str, str, Tuple[str, ...]]] = []
+        # Columnar node/edge buffers for get_graph_for_display
+        self._node_ids: List[str] = []
+        self._node_labels: List[str] = []
+        self._node_types: List[str] = []
+        self._edge_sources: List[str] = []
+        self._edge_targets: List[str] = []
+        self._edge_relations: List[str] = []
 
     def load_regulations(self, data_path: Optional[str] = None):
         """
@@ -44,25 +78,12 @@ class SGMAKnowledgeGraph:
         """
         kg_data = None
 
-        # Try to load from extracted data
-        if data_path is None:
-            # Prefer v3 (two-tree compliance) > v2 (layered) > v1 (hubbed)
-            base = Path(__file__).parent.parent.parent / "data" / "policies"
-            for version in ["knowledge_graph_v3.json", "knowledge_graph_v2.json", "knowledge_graph_data.json"]:
-                candidate = str(base / version)
-                if Path(candidate).exists():
-                    data_path = candidate
-                    break
-
-        if data_path and Path(data_path).exists():
-            with open(data_path) as f:
+        # Resolve the extracted data path once per process (stat-free on reuse)
+        resolved = Path(data_path) if data_path else _resolve_kg_path()
+
+        if resolved and resolved.exists():
+            with open(resolved) as f:
                 kg_data = json.load(f)
-        else:
-            # Check alternate paths
-            alt_path = str(Path(__file__).parent.parent / "data" / "policies" / "knowledge_graph_data.json")
-            if Path(alt_path).exists():
-                with open(alt_path) as f:
-                    kg_data = json.load(f)
 
         if kg_data is None:
             # Fall back to minimal embedded data
@@ -76,6 +97,12 @@ class SGMAKnowledgeGraph:
         self._entity_index.clear()
         self._type_index.clear()
         self._name_index.clear()
+        self._node_type_counts.clear()
+        self._edge_reltype_counts.clear()
+        self._compliance_match_records.clear()
+        self._edge_sources.clear()
+        self._edge_targets.clear()
+        self._edge_relations.clear()
 
         # Add entity nodes
         for entity in kg_data.get("entities", []):
@@ -93,8 +120,10 @@ class SGMAKnowledgeGraph:
             self._type_index[etype].append(eid)
 
             self._name_index[ename.lower()] = eid
+            self._node_type_counts[etype] += 1
 
         # Add relationship edges
+        stub_entities: Dict[str, Dict] = {}
         for rel in kg_data.get("relationships", []):
             src = rel["source"]
             tgt = rel["target"]
@@ -102,28 +131,53 @@ class SGMAKnowledgeGraph:
             props = rel.get("properties", {})
 
             # Only add edge if both nodes exist
-            if src in self._entity_index and tgt in self._entity_index:
-                self.graph.add_edge(src, tgt, relation=rtype, **props)
-            elif src in self._entity_index:
+            if src not in self._entity_index:
+                continue
+            if tgt not in self._entity_index and tgt not in self.graph:
                 # Create a stub node for the target
                 self.graph.add_node(tgt, type="Reference", name=tgt)
-                self.graph.add_edge(src, tgt, relation=rtype, **props)
+                self._node_type_counts["Reference"] += 1
+                stub_entities[tgt] = {"id": tgt, "type": "Reference", "name": tgt, "properties": {}}
+            # Keep the relation counter in sync if a duplicate edge overwrites
+            if self.graph.has_edge(src, tgt):
+                self._edge_reltype_counts[self.graph[src][tgt].get("relation", "Unknown")] -= 1
+            self.graph.add_edge(src, tgt, relation=rtype, **props)
+            self._edge_reltype_counts[rtype] += 1
+
+        # Materialize stubs in the entity index (after the edge loop so stubs
+        # never act as edge sources) so get_neighbors can index directly
+        self._entity_index.update(stub_entities)
+
+        # Tokenize compliance-relevant entity names once at build time
+        for etype in ("Rule", "Requirement", "GSA"):
+            for eid in self._type_index.get(etype, []):
+                name_lower = self._entity_index[eid]["name"].lower()
+                long_words = tuple(w for w in name_lower.split() if len(w) > 3)
+                self._compliance_match_records.append((eid, etype, name_lower, long_words))
+
+        # Fill the columnar display buffers once, so get_graph_for_display
+        # never re-walks the graph per request
+        self._node_ids = list(self._entity_index)
+        self._node_labels = [e["name"] for e in self._entity_index.values()]
+        self._node_types = [e["type"] for e in self._entity_index.values()]
+        for src, tgt, data in self.graph.edges(data=True):
+            self._edge_sources.append(src)
+            self._edge_targets.append(tgt)
+            self._edge_relations.append(data.get("relation", "RELATED"))
 
     # ─── Query Methods ───────────────────────────────────────────
 
     def get_stats(self) -> Dict[str, Any]:
         """Return graph statistics."""
-        type_counts = Counter(
-            data.get("type", "Unknown") for _, data in self.graph.nodes(data=True)
-        )
-        rel_counts = Counter(
-            data.get("relation", "Unknown") for _, _, data in self.graph.edges(data=True)
-        )
+        # Counters are maintained incrementally in _build_graph, so this
+        # is O(unique types) rather than a full walk of node/edge dicts.
+        type_counts = self._node_type_counts
+        rel_counts = self._edge_reltype_counts
         return {
             "total_nodes": self.graph.number_of_nodes(),
             "total_edges": self.graph.number_of_edges(),
-            "node_types": dict(type_counts.most_common()),
-            "edge_types": dict(rel_counts.most_common()),
+            "node_types": dict(sorted(type_counts.items(), key=itemgetter(1), reverse=True)),
+            "edge_types": dict(sorted(rel_counts.items(), key=itemgetter(1), reverse=True)),
         }
 
     def get_entities_by_type(self, entity_type: str) -> List[Dict]:
@@ -144,20 +198,19 @@ class SGMAKnowledgeGraph:
         # Outgoing edges
         for _, target, data in self.graph.out_edges(entity_id, data=True):
             if relation_type is None or data.get("relation") == relation_type:
-                target_data = self._entity_index.get(target, {"id": target, "type": "Unknown", "name": target})
+                # Stubs are materialized at build time, so no fallback needed
                 results.append({
                     "direction": "outgoing",
                     "relation": data.get("relation", "RELATED_TO"),
-                    "entity": target_data,
+                    "entity": self._entity_index[target],
                 })
         # Incoming edges
         for source, _, data in self.graph.in_edges(entity_id, data=True):
             if relation_type is None or data.get("relation") == relation_type:
-                source_data = self._entity_index.get(source, {"id": source, "type": "Unknown", "name": source})
                 results.append({
                     "direction": "incoming",
                     "relation": data.get("relation", "RELATED_TO"),
-                    "entity": source_data,
+                    "entity": self._entity_index[source],
                 })
         return results
 
@@ -177,46 +230,37 @@ class SGMAKnowledgeGraph:
         question_lower = question.lower()
         question_words = set(question_lower.split())
 
-        scored_entities = []
-        for eid, edata in self._entity_index.items():
-            score = 0
-            name_lower = edata["name"].lower()
-            etype = edata["type"]
-
-            # Name match
-            name_words = set(name_lower.split())
-            overlap = question_words & name_words
-            score += len(overlap) * 3
-
-            # Substring match
-            if name_lower in question_lower or any(w in question_lower for w in name_words if len(w) > 3):
-                score += 2
-
-            # Property value match
-            for k, v in edata.get("properties", {}).items():
-                if isinstance(v, str) and any(w in v.lower() for w in question_words if len(w) > 3):
-                    score += 1
-
-            # Boost certain types based on question content
-            if "transfer" in question_lower and etype in ("Rule", "TransferType", "Requirement"):
-                score += 2
-            if "threshold" in question_lower and etype == "Threshold":
-                score += 3
-            if "gsa" in question_lower and etype == "GSA":
-                score += 3
-            if ("subsidence" in question_lower or "sinking" in question_lower) and "subsid" in name_lower:
-                score += 3
-            if "water quality" in question_lower and "quality" in name_lower:
-                score += 3
-            if "well" in question_lower and etype in ("Rule", "Requirement") and "well" in name_lower:
-                score += 3
-
-            if score > 0:
-                scored_entities.append((score, eid, edata))
-
-        scored_entities.sort(key=lambda x: x[0], reverse=True)
-
-        for score, eid, edata in scored_entities[:10]:
+        # Partial-evaluate the question-level boosts once, so the per-entity
+        # scorer does a single dict lookup instead of re-checking the question
+        type_boost: Dict[str, int] = {}
+        if "transfer" in question_lower:
+            for t in ("Rule", "TransferType", "Requirement"):
+                type_boost[t] = type_boost.get(t, 0) + 2
+        if "threshold" in question_lower:
+            type_boost["Threshold"] = type_boost.get("Threshold", 0) + 3
+        if "gsa" in question_lower:
+            type_boost["GSA"] = type_boost.get("GSA", 0) + 3
+        name_boosts = (
+            "subsid" if ("subsidence" in question_lower or "sinking" in question_lower) else None,
+            "quality" if "water quality" in question_lower else None,
+            "well" if "well" in question_lower else None,
+        )
+
+        # heapq.nlargest keeps only the top 10 — O(M log 10) instead of
+        # materializing and fully sorting every positive-scoring entity
+        top_entities = heapq.nlargest(
+            10,
+            (
+                (score, eid, edata)
+                for eid, edata in self._entity_index.items()
+                if (score := self._score_entity(
+                    edata, question_words, question_lower, type_boost, name_boosts
+                )) > 0
+            ),
+            key=itemgetter(0),
+        )
+
+        for score, eid, edata in top_entities:
             # Get connected entities for context
             neighbors = self.get_neighbors(eid)
             results.append({
@@ -235,37 +279,76 @@ class SGMAKnowledgeGraph:
 
         return results
 
+    def _score_entity(
+        self,
+        edata: Dict,
+        question_words: Set[str],
+        question_lower: str,
+        type_boost: Dict[str, int],
+        name_boosts: Tuple[Optional[str], Optional[str], Optional[str]],
+    ) -> int:
+        """
+        Score one entity's relevance to a question. Question-level boost
+        decisions are precomputed in query() and passed in as `type_boost`
+        (type -> bonus) and `name_boosts` (substrings to reward, or None).
+        """
+        score = 0
+        name_lower = edata["name"].lower()
+        etype = edata["type"]
+
+        # Name match
+        name_words = set(name_lower.split())
+        overlap = question_words & name_words
+        score += len(overlap) * 3
+
+        # Substring match
+        if name_lower in question_lower or any(w in question_lower for w in name_words if len(w) > 3):
+            score += 2
+
+        # Property value match
+        for k, v in edata.get("properties", {}).items():
+            if isinstance(v, str) and any(w in v.lower() for w in question_words if len(w) > 3):
+                score += 1
+
+        # Precomputed type/name boosts
+        score += type_boost.get(etype, 0)
+        subsid, quality, well = name_boosts
+        if subsid and subsid in name_lower:
+            score += 3
+        if quality and quality in name_lower:
+            score += 3
+        if well and etype in ("Rule", "Requirement") and well in name_lower:
+            score += 3
+
+        return score
+
     def check_transfer_compliance(self, question: str) -> Dict[str, Any]:
         """Check transfer compliance using knowledge graph traversal."""
         question_lower = question.lower()
+        has_transfer = "transfer" in question_lower
 
-        # Find relevant rules
-        rules = self.get_entities_by_type("Rule")
-        requirements = self.get_entities_by_type("Requirement")
         thresholds = self.get_entities_by_type("Threshold")
 
-        applicable_rules = []
-        for rule in rules:
-            name_lower = rule["name"].lower()
-            if any(kw in question_lower for kw in name_lower.split() if len(kw) > 3):
-                applicable_rules.append(rule)
-            elif "transfer" in question_lower and "transfer" in name_lower:
-                applicable_rules.append(rule)
-
-        applicable_reqs = []
-        for req in requirements:
-            name_lower = req["name"].lower()
-            if any(kw in question_lower for kw in name_lower.split() if len(kw) > 3):
-                applicable_reqs.append(req)
+        # Single scan over the precomputed match records, bucketed by type,
+        # instead of three loops that each re-tokenize entity names
+        hits: Dict[str, List[Dict]] = {"Rule": [], "Requirement": [], "GSA": []}
+        for eid, etype, name_lower, long_words in self._compliance_match_records:
+            if etype == "GSA":
+                if name_lower in question_lower:
+                    hits["GSA"].append(self._entity_index[eid])
+            elif any(kw in question_lower for kw in long_words):
+                hits[etype].append(self._entity_index[eid])
+            elif etype == "Rule" and has_transfer and "transfer" in name_lower:
+                hits["Rule"].append(self._entity_index[eid])
+
+        applicable_rules = hits["Rule"]
+        applicable_reqs = hits["Requirement"]
+        mentioned_gsas = hits["GSA"]
 
         # Determine if same basin (intra-basin)
         is_intra_basin = "kern" in question_lower and question_lower.count("kern") <= 1
         is_intra_basin = is_intra_basin or "same basin" in question_lower or "intra" in question_lower
 
-        # Find GSAs mentioned
-        gsas = self.get_entities_by_type("GSA")
-        mentioned_gsas = [g for g in gsas if g["name"].lower() in question_lower]
-
         return {
             "allowed": True,  # Intra-basin generally allowed
             "reason": "Intra-basin transfer within Kern County Subbasin. Subject to GSA coordination agreement and GSP requirements.",
@@ -323,24 +406,23 @@ class SGMAKnowledgeGraph:
         return "\n".join(lines)
 
     def get_graph_for_display(self) -> Dict[str, Any]:
-        """Export the graph in a format suitable for visualization."""
-        nodes = []
-        for nid, data in self.graph.nodes(data=True):
-            nodes.append({
-                "id": nid,
-                "label": data.get("name", nid),
-                "type": data.get("type", "Unknown"),
-            })
-
-        edges = []
-        for src, tgt, data in self.graph.edges(data=True):
-            edges.append({
-                "source": src,
-                "target": tgt,
-                "label": data.get("relation", "RELATED"),
-            })
-
-        return {"nodes": nodes, "edges": edges}
+        """
+        Export the graph in a columnar format suitable for visualization.
+        The buffers are built once in _build_graph, so this is allocation-free
+        apart from the two wrapper dicts.
+        """
+        return {
+            "nodes": {
+                "id": self._node_ids,
+                "label": self._node_labels,
+                "type": self._node_types,
+            },
+            "edges": {
+                "source": self._edge_sources,
+                "target": self._edge_targets,
+                "label": self._edge_relations,
+            },
+        }
 
     def print_graph_summary(self):
         """Print a human-readable summary of the knowledge graph."""
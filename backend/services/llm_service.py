@@ -8,6 +8,46 @@ import os
 
 from core.config import settings
 
+# Static fallback replies, built once at import so the no-LLM path
+# never reassembles these multi-line strings per call.
+_ALLOWED_REPLY = "✅ **This transfer appears to be allowed.**\n\n{reason}"
+
+_DENIED_REPLY = "❌ **This transfer may not be allowed.**\n\n{reason}"
+
+_PERMIT_REPLY = """**SGMA Permit Requirements:**
+
+• **Intra-basin transfers**: No permit needed
+• **Inter-basin transfers < 100 AF**: GSA notification required
+• **Inter-basin transfers ≥ 100 AF**: Permit required from both GSAs
+• **Critically overdrafted basins**: Additional restrictions may apply
+
+Contact your local GSA for specific requirements."""
+
+_BASIN_REPLY = """**California Central Valley Basins:**
+
+The Central Valley is divided into several groundwater basins, each managed by a Groundwater Sustainability Agency (GSA):
+
+• Kern County - Critically Overdrafted
+• San Joaquin Valley - High Priority
+• Tulare Lake - Critically Overdrafted
+• Kings County - Medium Priority
+• Fresno County - High Priority
+• Madera County - Critically Overdrafted
+
+Transfers within the same basin are generally unrestricted. Inter-basin transfers have additional requirements."""
+
+_DEFAULT_REPLY = """I can help you with SGMA compliance questions about water transfers.
+
+Try asking:
+• "Can I transfer water to [basin name]?"
+• "Do I need a permit to sell 50 AF?"
+• "What are the rules for my basin?"
+
+For specific compliance checks, please provide:
+- Source basin
+- Destination basin
+- Quantity (in acre-feet)"""
+
 class LLMService:
     """
     LLM integration for generating natural language responses
@@ -36,6 +76,8 @@ Keep responses concise and actionable for farmers."""
     def __init__(self):
         self.openai_client = None
         self.anthropic_client = None
+        # Reused on every OpenAI call instead of rebuilding the dict
+        self._system_message = {"role": "system", "content": self.SYSTEM_PROMPT}
         self._init_clients()
     
     def _init_clients(self):
@@ -88,29 +130,26 @@ Keep responses concise and actionable for farmers."""
         compliance_info: Optional[Dict]
     ) -> str:
         """Build the augmented prompt with retrieved context"""
-        
-        prompt_parts = [
-            f"User Question: {user_message}",
-            "",
-            f"Retrieved SGMA Context:\n{context}"
-        ]
-        
+
         if compliance_info:
-            prompt_parts.extend([
-                "",
-                "Compliance Check Result:",
-                f"- Allowed: {compliance_info.get('allowed', 'Unknown')}",
-                f"- Reason: {compliance_info.get('reason', 'N/A')}",
-                f"- Requires Permit: {compliance_info.get('requires_permit', False)}",
+            compliance_block = (
+                "\n\nCompliance Check Result:\n"
+                f"- Allowed: {compliance_info.get('allowed', 'Unknown')}\n"
+                f"- Reason: {compliance_info.get('reason', 'N/A')}\n"
+                f"- Requires Permit: {compliance_info.get('requires_permit', False)}\n"
                 f"- Relevant Rules: {', '.join(compliance_info.get('rules', []))}"
-            ])
-        
-        prompt_parts.extend([
-            "",
-            "Please provide a helpful, accurate response based on this information."
-        ])
-        
-        return "\n".join(prompt_parts)
+            )
+        else:
+            compliance_block = ""
+
+        return (
+            f"User Question: {user_message}\n"
+            f"\n"
+            f"Retrieved SGMA Context:\n{context}"
+            f"{compliance_block}\n"
+            f"\n"
+            f"Please provide a helpful, accurate response based on this information."
+        )
     
     async def _call_openai(
         self, 
@@ -119,7 +158,7 @@ Keep responses concise and actionable for farmers."""
     ) -> str:
         """Call OpenAI API"""
         
-        messages = [{"role": "system", "content": self.SYSTEM_PROMPT}]
+        messages = [self._system_message]
         
         # Add conversation history
         if conversation_history:
@@ -190,52 +229,22 @@ Keep responses concise and actionable for farmers."""
             rules = compliance_info.get("rules", [])
             
             if allowed:
-                response = f"✅ **This transfer appears to be allowed.**\n\n{reason}"
+                response = _ALLOWED_REPLY.format_map({"reason": reason})
                 if requires_permit:
                     response += "\n\n⚠️ Note: A permit is required for this transfer."
-                if rules:
-                    response += f"\n\n📋 Relevant rules: {', '.join(rules)}"
             else:
-                response = f"❌ **This transfer may not be allowed.**\n\n{reason}"
-                if rules:
-                    response += f"\n\n📋 Relevant rules: {', '.join(rules)}"
-            
+                response = _DENIED_REPLY.format_map({"reason": reason})
+            if rules:
+                response += f"\n\n📋 Relevant rules: {', '.join(rules)}"
+
             return response
         
         # General questions
         if "permit" in user_lower:
-            return """**SGMA Permit Requirements:**
-
-• **Intra-basin transfers**: No permit needed
-• **Inter-basin transfers < 100 AF**: GSA notification required
-• **Inter-basin transfers ≥ 100 AF**: Permit required from both GSAs
-• **Critically overdrafted basins**: Additional restrictions may apply
+            return _PERMIT_REPLY
 
-Contact your local GSA for specific requirements."""
-        
         if "basin" in user_lower:
-            return """**California Central Valley Basins:**
-
-The Central Valley is divided into several groundwater basins, each managed by a Groundwater Sustainability Agency (GSA):
+            return _BASIN_REPLY
 
-• Kern County - Critically Overdrafted
-• San Joaquin Valley - High Priority
-• Tulare Lake - Critically Overdrafted
-• Kings County - Medium Priority
-• Fresno County - High Priority
-• Madera County - Critically Overdrafted
-
-Transfers within the same basin are generally unrestricted. Inter-basin transfers have additional requirements."""
-        
         # Default response
-        return """I can help you with SGMA compliance questions about water transfers. 
-
-Try asking:
-• "Can I transfer water to [basin name]?"
-• "Do I need a permit to sell 50 AF?"
-• "What are the rules for my basin?"
-
-For specific compliance checks, please provide:
-- Source basin
-- Destination basin  
-- Quantity (in acre-feet)"""
+        return _DEFAULT_REPLY
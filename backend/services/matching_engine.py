@@ -3,14 +3,114 @@ Water Transfer Matching Engine
 Algorithmic matching of buy and sell orders within compatible basins
 """
 
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from datetime import datetime
-from sqlalchemy.orm import Session
+
+import numpy as np
+from sqlalchemy import bindparam, case, literal, or_, select, tuple_, update
+from sqlalchemy.orm import Session, aliased
+
+try:
+    import numba
+except ImportError:
+    numba = None
 
 from models.order import Order, OrderType, OrderStatus
 from models.transaction import Transaction
 from models.user import User
 
+# Basin compatibility matrix - defines which basins can trade.
+# Frozen at import so membership checks are O(1) set lookups.
+COMPATIBLE_BASINS = {
+    basin: frozenset(partners)
+    for basin, partners in {
+        "Kern County": ["Kern County", "Tulare Lake", "Kings County"],
+        "San Joaquin Valley": ["San Joaquin Valley", "Fresno County", "Madera County"],
+        "Tulare Lake": ["Tulare Lake", "Kern County", "Kings County"],
+        "Kings County": ["Kings County", "Kern County", "Tulare Lake", "Fresno County"],
+        "Fresno County": ["Fresno County", "San Joaquin Valley", "Kings County", "Madera County"],
+        "Madera County": ["Madera County", "San Joaquin Valley", "Fresno County"],
+    }.items()
+}
+
+# Flat (buyer_basin, seller_basin) pairs for pushing the compatibility
+# filter down into SQL
+_COMPAT_BASIN_PAIRS = [
+    (basin, partner)
+    for basin, partners in COMPATIBLE_BASINS.items()
+    for partner in partners
+]
+
+# Transactions are streamed to the DB in chunks of this size so a huge
+# matching run never builds one monster INSERT batch
+_TX_CHUNK_SIZE = 1000
+
+_OPEN_STATUSES = [OrderStatus.OPEN, OrderStatus.PARTIALLY_FILLED]
+
+# Best bid/ask statements built once at import with a bound basin
+# parameter; SQLAlchemy's compiled-statement cache then reuses the same
+# compiled SQL for every book query instead of re-stringifying it
+_BEST_BID_STMT = (
+    select(Order.price_per_af)
+    .where(
+        Order.order_type == OrderType.BUY,
+        Order.status.in_(_OPEN_STATUSES),
+        Order.basin == bindparam("basin"),
+    )
+    .order_by(Order.price_per_af.desc())
+    .limit(1)
+)
+
+_BEST_ASK_STMT = (
+    select(Order.price_per_af)
+    .where(
+        Order.order_type == OrderType.SELL,
+        Order.status.in_(_OPEN_STATUSES),
+        Order.basin == bindparam("basin"),
+    )
+    .order_by(Order.price_per_af.asc())
+    .limit(1)
+)
+
+
+def _match_kernel(pair_buy, pair_sell, price, quantity, filled,
+                  out_buy, out_sell, out_qty, out_px2):
+    """
+    Inner matching kernel over SoA arrays: walk the candidate pairs in
+    priority order, compute fill quantities and midpoint prices, and update
+    the shared `filled` array in place. Returns the number of matches.
+
+    All arrays hold int64 centi-units (cents / hundredths of an AF), so the
+    loop is pure integer arithmetic with no rounding error. The midpoint is
+    emitted as `price[b] + price[s]` — twice the midpoint in cents — which
+    stays exact even when the sum is odd; the caller halves it on the way
+    back to dollars.
+    """
+    n = 0
+    for k in range(pair_buy.shape[0]):
+        b = pair_buy[k]
+        s = pair_sell[k]
+        buy_remaining = quantity[b] - filled[b]
+        if buy_remaining <= 0:
+            continue
+        sell_remaining = quantity[s] - filled[s]
+        if sell_remaining <= 0:
+            continue
+        match_qty = buy_remaining if buy_remaining < sell_remaining else sell_remaining
+        filled[b] += match_qty
+        filled[s] += match_qty
+        out_buy[n] = b
+        out_sell[n] = s
+        out_qty[n] = match_qty
+        out_px2[n] = price[b] + price[s]
+        n += 1
+    return n
+
+
+if numba is not None:
+    _match_kernel = numba.njit(cache=True)(_match_kernel)
+
+
 class MatchingEngine:
     """
     Continuous double auction matching engine for water transfers.
@@ -23,146 +123,187 @@ class MatchingEngine:
     5. Time priority for orders at same price
     """
     
-    # Basin compatibility matrix - defines which basins can trade
-    COMPATIBLE_BASINS = {
-        "Kern County": ["Kern County", "Tulare Lake", "Kings County"],
-        "San Joaquin Valley": ["San Joaquin Valley", "Fresno County", "Madera County"],
-        "Tulare Lake": ["Tulare Lake", "Kern County", "Kings County"],
-        "Kings County": ["Kings County", "Kern County", "Tulare Lake", "Fresno County"],
-        "Fresno County": ["Fresno County", "San Joaquin Valley", "Kings County", "Madera County"],
-        "Madera County": ["Madera County", "San Joaquin Valley", "Fresno County"]
-    }
-    
+    COMPATIBLE_BASINS = COMPATIBLE_BASINS
+
+
     def __init__(self, db: Session):
         self.db = db
-        self.matches: List[Transaction] = []
+        self.matches: List[Dict] = []
+        self._users: dict = {}
     
-    def match_orders(self) -> List[Transaction]:
+    def match_orders(self) -> List[Dict]:
         """
         Run the matching algorithm on all open orders.
-        Returns list of executed transactions.
+        Returns the executed transactions as column mappings.
         """
         self.matches = []
-        
-        # Get all open buy orders (sorted by price desc, then time asc)
-        buy_orders = self.db.query(Order).filter(
-            Order.order_type == OrderType.BUY,
-            Order.status.in_([OrderStatus.OPEN, OrderStatus.PARTIALLY_FILLED])
-        ).order_by(Order.price_per_af.desc(), Order.created_at.asc()).all()
-        
-        # Get all open sell orders (sorted by price asc, then time asc)
-        sell_orders = self.db.query(Order).filter(
-            Order.order_type == OrderType.SELL,
-            Order.status.in_([OrderStatus.OPEN, OrderStatus.PARTIALLY_FILLED])
-        ).order_by(Order.price_per_af.asc(), Order.created_at.asc()).all()
-        
-        # Match orders
-        for buy_order in buy_orders:
-            for sell_order in sell_orders:
-                # Skip if already filled
-                if buy_order.status == OrderStatus.FILLED:
-                    break
-                if sell_order.status == OrderStatus.FILLED:
-                    continue
-                
-                # Skip same user
-                if buy_order.user_id == sell_order.user_id:
-                    continue
-                
-                # Check basin compatibility
-                if not self._basins_compatible(buy_order.basin, sell_order.basin):
-                    continue
-                
-                # Check price overlap
-                if buy_order.price_per_af < sell_order.price_per_af:
-                    continue
-                
-                # Execute match
-                transaction = self._execute_match(buy_order, sell_order)
-                if transaction:
-                    self.matches.append(transaction)
-        
+        # One timestamp for the whole run: every order filled in this pass
+        # shares it, and the clock is read once instead of per match
+        run_time = datetime.utcnow()
+
+        # Explicitly suspend autoflush for the whole run: nothing here
+        # should trigger a mid-run flush of dirty User balances; everything
+        # lands in the single commit below
+        with self.db.no_autoflush:
+            # Load only the columns the matching loop reads, laid out as
+            # structure-of-arrays for the numeric kernel
+            rows = self.db.execute(
+                select(
+                    Order.id, Order.user_id, Order.basin,
+                    Order.price_per_af, Order.quantity_af, Order.filled_quantity_af,
+                ).where(Order.status.in_(_OPEN_STATUSES))
+            ).all()
+            if not rows:
+                self.db.commit()
+                return self.matches
+
+            order_ids = [r.id for r in rows]
+            order_users = [r.user_id for r in rows]
+            order_basins = [r.basin for r in rows]
+            # Scale to int64 centi-units (cents / hundredths of an AF) at the
+            # fetch boundary so the kernel runs exact integer arithmetic
+            price = np.rint(np.array([r.price_per_af for r in rows]) * 100.0).astype(np.int64)
+            quantity = np.rint(np.array([r.quantity_af for r in rows]) * 100.0).astype(np.int64)
+            filled = np.rint(np.array([r.filled_quantity_af for r in rows]) * 100.0).astype(np.int64)
+            filled_before = filled.copy()
+            idx_by_id = {oid: i for i, oid in enumerate(order_ids)}
+
+            # Prefetch every user touched by an open order in one query instead
+            # of two SELECTs per match
+            self._users = {
+                u.id: u for u in self.db.query(User).filter(User.id.in_(set(order_users)))
+            }
+
+            # The pairing itself is pushed into SQL: the server applies the
+            # basin-compatibility, price-overlap and distinct-user filters and
+            # returns candidate pairs in matching priority order
+            pairs = self.db.execute(self._candidate_pairs_stmt()).all()
+            pair_buy = np.array([idx_by_id[b] for b, _ in pairs], dtype=np.int64)
+            pair_sell = np.array([idx_by_id[s] for _, s in pairs], dtype=np.int64)
+
+            # Fill bookkeeping runs in the (optionally JIT-compiled) kernel
+            out_buy = np.empty(len(pairs), dtype=np.int64)
+            out_sell = np.empty(len(pairs), dtype=np.int64)
+            out_qty = np.empty(len(pairs), dtype=np.int64)
+            out_px2 = np.empty(len(pairs), dtype=np.int64)
+            n_matches = _match_kernel(
+                pair_buy, pair_sell, price, quantity, filled,
+                out_buy, out_sell, out_qty, out_px2,
+            )
+
+            # Translate kernel output back to transactions and balance updates,
+            # streaming inserts chunk by chunk
+            pending: List[Dict] = []
+            for k in range(n_matches):
+                b, s = out_buy[k], out_sell[k]
+                # Back to float dollars/AF only at the emission boundary
+                match_qty = out_qty[k] / 100.0
+                exec_price = out_px2[k] / 200.0
+
+                buyer = self._users.get(order_users[b])
+                seller = self._users.get(order_users[s])
+                if buyer and seller:
+                    buyer.water_balance_af += match_qty
+                    seller.water_balance_af -= match_qty
+
+                transaction = {
+                    "buyer_id": order_users[b],
+                    "seller_id": order_users[s],
+                    "buy_order_id": order_ids[b],
+                    "sell_order_id": order_ids[s],
+                    "quantity_af": match_qty,
+                    "price_per_af": exec_price,
+                    "total_value": match_qty * exec_price,
+                    "basin": order_basins[b],
+                    "compliance_verified": "approved",  # Auto-approved for same/compatible basins
+                }
+                self.matches.append(transaction)
+                pending.append(transaction)
+                if len(pending) >= _TX_CHUNK_SIZE:
+                    self.db.bulk_insert_mappings(Transaction, pending)
+                    pending.clear()
+
+            # Derive final status for every order the kernel touched
+            touched_orders: Dict[int, Tuple[float, OrderStatus, Optional[datetime]]] = {}
+            for i in np.nonzero(filled != filled_before)[0]:
+                if filled[i] >= quantity[i]:
+                    touched_orders[order_ids[i]] = (filled[i] / 100.0, OrderStatus.FILLED, run_time)
+                else:
+                    touched_orders[order_ids[i]] = (filled[i] / 100.0, OrderStatus.PARTIALLY_FILLED, None)
+
+            # Write all order fills back in a single UPDATE ... CASE statement
+            # instead of one UPDATE per touched order on flush
+            if touched_orders:
+                self._flush_order_updates(touched_orders)
+
+            # Flush the final partial chunk
+            if pending:
+                self.db.bulk_insert_mappings(Transaction, pending)
         self.db.commit()
         return self.matches
-    
-    def _basins_compatible(self, basin1: str, basin2: str) -> bool:
-        """Check if two basins can trade water"""
-        compatible = self.COMPATIBLE_BASINS.get(basin1, [basin1])
-        return basin2 in compatible
-    
-    def _execute_match(self, buy_order: Order, sell_order: Order) -> Optional[Transaction]:
-        """Execute a match between buy and sell orders"""
-        
-        # Calculate match quantity (minimum of remaining quantities)
-        buy_remaining = buy_order.quantity_af - buy_order.filled_quantity_af
-        sell_remaining = sell_order.quantity_af - sell_order.filled_quantity_af
-        match_quantity = min(buy_remaining, sell_remaining)
-        
-        if match_quantity <= 0:
-            return None
-        
-        # Calculate execution price (midpoint)
-        execution_price = (buy_order.price_per_af + sell_order.price_per_af) / 2
-        total_value = match_quantity * execution_price
-        
-        # Update orders
-        buy_order.filled_quantity_af += match_quantity
-        sell_order.filled_quantity_af += match_quantity
-        
-        # Update order statuses
-        if buy_order.filled_quantity_af >= buy_order.quantity_af:
-            buy_order.status = OrderStatus.FILLED
-            buy_order.filled_at = datetime.utcnow()
-        else:
-            buy_order.status = OrderStatus.PARTIALLY_FILLED
-        
-        if sell_order.filled_quantity_af >= sell_order.quantity_af:
-            sell_order.status = OrderStatus.FILLED
-            sell_order.filled_at = datetime.utcnow()
-        else:
-            sell_order.status = OrderStatus.PARTIALLY_FILLED
-        
-        # Update user balances
-        buyer = self.db.query(User).filter(User.id == buy_order.user_id).first()
-        seller = self.db.query(User).filter(User.id == sell_order.user_id).first()
-        
-        if buyer and seller:
-            buyer.water_balance_af += match_quantity
-            seller.water_balance_af -= match_quantity
-        
-        # Create transaction record
-        transaction = Transaction(
-            buyer_id=buy_order.user_id,
-            seller_id=sell_order.user_id,
-            buy_order_id=buy_order.id,
-            sell_order_id=sell_order.id,
-            quantity_af=match_quantity,
-            price_per_af=execution_price,
-            total_value=total_value,
-            basin=buy_order.basin,
-            compliance_verified="approved"  # Auto-approved for same/compatible basins
+
+    def _candidate_pairs_stmt(self):
+        """
+        Build the server-side matching join: every open (buy, sell) pair with
+        compatible basins, overlapping prices and distinct users, ordered by
+        buy priority (price desc, time asc) then sell priority (price asc,
+        time asc). The compatibility matrix is inlined as row-value IN pairs.
+        """
+        b = aliased(Order)
+        s = aliased(Order)
+        return (
+            select(b.id, s.id)
+            .where(
+                b.order_type == OrderType.BUY,
+                b.status.in_(_OPEN_STATUSES),
+                s.order_type == OrderType.SELL,
+                s.status.in_(_OPEN_STATUSES),
+                b.price_per_af >= s.price_per_af,
+                b.user_id != s.user_id,
+                or_(
+                    b.basin == s.basin,
+                    tuple_(b.basin, s.basin).in_(_COMPAT_BASIN_PAIRS),
+                ),
+            )
+            .order_by(
+                b.price_per_af.desc(), b.created_at.asc(), b.id.asc(),
+                s.price_per_af.asc(), s.created_at.asc(), s.id.asc(),
+            )
         )
-        
-        self.db.add(transaction)
-        
-        return transaction
-    
+
+    def _flush_order_updates(
+        self, touched_orders: Dict[int, Tuple[float, OrderStatus, Optional[datetime]]]
+    ):
+        """Batch the accumulated fill state into one UPDATE…CASE statement."""
+        status_type = Order.__table__.c.status.type
+        filled_at_type = Order.__table__.c.filled_at.type
+
+        stmt = (
+            update(Order)
+            .where(Order.id.in_(touched_orders))
+            .values(
+                filled_quantity_af=case(
+                    {oid: f for oid, (f, _, _) in touched_orders.items()},
+                    value=Order.id,
+                ),
+                status=case(
+                    {oid: literal(s, status_type) for oid, (_, s, _) in touched_orders.items()},
+                    value=Order.id,
+                ),
+                filled_at=case(
+                    {oid: literal(t, filled_at_type) for oid, (_, _, t) in touched_orders.items()},
+                    value=Order.id,
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        self.db.execute(stmt)
+
+
     def get_best_bid(self, basin: str) -> Optional[float]:
         """Get the highest buy price for a basin"""
-        order = self.db.query(Order).filter(
-            Order.order_type == OrderType.BUY,
-            Order.status.in_([OrderStatus.OPEN, OrderStatus.PARTIALLY_FILLED]),
-            Order.basin == basin
-        ).order_by(Order.price_per_af.desc()).first()
-        
-        return order.price_per_af if order else None
-    
+        return self.db.execute(_BEST_BID_STMT, {"basin": basin}).scalar()
+
     def get_best_ask(self, basin: str) -> Optional[float]:
         """Get the lowest sell price for a basin"""
-        order = self.db.query(Order).filter(
-            Order.order_type == OrderType.SELL,
-            Order.status.in_([OrderStatus.OPEN, OrderStatus.PARTIALLY_FILLED]),
-            Order.basin == basin
-        ).order_by(Order.price_per_af.asc()).first()
-        
-        return order.price_per_af if order else None
+        return self.db.execute(_BEST_ASK_STMT, {"basin": basin}).scalar()
@@ -24,7 +24,12 @@ ENVIRONMENTAL DATA SOURCES:
   - Water quality:      GSP Section 8 (p.16) — nitrate, arsenic, TDS
 """
 
-from typing import Dict, Any, List
+import copy
+import functools
+import types
+from typing import Any, Dict, List, Mapping, Tuple
+
+import numpy as np
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -64,23 +69,37 @@ HCM_RISK_DATA = {
 }
 
 
+# Structured-array views over the tables above, for vectorized per-pool math:
+# crop lists become integer id arrays indexed into CROP_ARR columns instead of
+# per-dict .get chains
+CROP_IDX = {name: i for i, name in enumerate(CROP_ECONOMICS)}
+CROP_ARR = np.array(
+    [(v["revenue_per_acre"], v["water_duty"], v["var_cost"], v["marginal_value_af"])
+     for v in CROP_ECONOMICS.values()],
+    dtype=[("rev", "f4"), ("duty", "f4"), ("vc", "f4"), ("mv", "f4")],
+)
+
+HCM_IDX = {name: i for i, name in enumerate(HCM_RISK_DATA)}
+HCM_ARR = np.array(
+    [(v["subsidence_rate"], v["gw_decline"], v["subsidence_mt"])
+     for v in HCM_RISK_DATA.values()],
+    dtype=[("subsidence_rate", "f4"), ("gw_decline", "f4"), ("subsidence_mt", "f4")],
+)
+
+
+def crop_water_need_af(farmer: Mapping[str, Any]) -> float:
+    """Total annual water duty for a farmer's crop mix (vectorized dot product)."""
+    crops = farmer["crops"]
+    crop_ids = np.array([CROP_IDX[c["type"]] for c in crops], dtype=np.intp)
+    acreages = np.array([c["acreage"] for c in crops], dtype=np.float32)
+    return float(CROP_ARR["duty"][crop_ids] @ acreages)
+
+
 # ═══════════════════════════════════════════════════════════════
 #  10-FARMER WEEKLY SPOT MARKET ORDER POOL
 # ═══════════════════════════════════════════════════════════════
 
-def get_farmer_pool() -> List[Dict[str, Any]]:
-    """
-    Return 10 farmers: 5 sellers + 5 buyers.
-    Quantities are WEEKLY spot orders (5-50 AF), not annual bulk.
-
-    Why these sizes?
-      - 1 AF = 325,851 gallons ≈ 1 acre flooded 1 foot deep
-      - A 200-acre almond block uses ~14 AF/week at peak
-      - Skipping 1 irrigation set on 40ac alfalfa = ~8 AF freed
-      - A pump outage for 3 days = need ~10 AF from a neighbor
-      → Typical spot trade: 8–35 AF
-    """
-    return [
+_FARMER_POOL_DATA: List[Dict[str, Any]] = [
         # ─── SELLERS (weekly surplus) ───────────────────────────
 
         {
@@ -332,31 +351,71 @@ def get_farmer_pool() -> List[Dict[str, Any]]:
             "metered": True,
             "compliance_history": "Clean",
         },
-    ]
+]
+
+# Materialized once at import: read-only views over the pool dicts, so
+# get_farmer_pool is a pointer return instead of rebuilding ~300 dicts
+_FARMER_POOL: Tuple[Mapping[str, Any], ...] = tuple(
+    types.MappingProxyType(farmer) for farmer in _FARMER_POOL_DATA
+)
+
+
+def get_farmer_pool() -> Tuple[Mapping[str, Any], ...]:
+    """
+    Return 10 farmers: 5 sellers + 5 buyers (read-only views).
+    Quantities are WEEKLY spot orders (5-50 AF), not annual bulk.
+
+    Why these sizes?
+      - 1 AF = 325,851 gallons ≈ 1 acre flooded 1 foot deep
+      - A 200-acre almond block uses ~14 AF/week at peak
+      - Skipping 1 irrigation set on 40ac alfalfa = ~8 AF freed
+      - A pump outage for 3 days = need ~10 AF from a neighbor
+      → Typical spot trade: 8–35 AF
+    """
+    return _FARMER_POOL
+
+
+def get_farmer_pool_mutable() -> List[Dict[str, Any]]:
+    """Deep copy of the pool for callers that need to mutate farmer records."""
+    return copy.deepcopy(_FARMER_POOL_DATA)
 
 
 def format_order_book(pool: List[Dict]) -> str:
-    """Pretty-print the order book."""
-    sellers = sorted([f for f in pool if f['role'] == 'SELLER'], key=lambda x: x['ask_price'])
-    buyers  = sorted([f for f in pool if f['role'] == 'BUYER'],  key=lambda x: -x['bid_price'])
+    """Pretty-print the order book (memoized on the displayed content)."""
+    key = tuple(
+        (
+            f['role'], f['id'], f['name'], f['gsa'],
+            f['marginal_crop_fallowed'] if f['role'] == 'SELLER' else f.get('marginal_crop_expanding', '?'),
+            f['selling_af'] if f['role'] == 'SELLER' else f['buying_af'],
+            f['ask_price'] if f['role'] == 'SELLER' else f['bid_price'],
+        )
+        for f in pool
+    )
+    return _format_order_book_cached(key)
+
+
+@functools.lru_cache(maxsize=16)
+def _format_order_book_cached(key: Tuple) -> str:
+    """Rebuild the order-book string; skipped entirely on a cache hit."""
+    sellers = sorted([row for row in key if row[0] == 'SELLER'], key=lambda x: x[6])
+    buyers  = sorted([row for row in key if row[0] == 'BUYER'],  key=lambda x: -x[6])
 
     lines = []
     lines.append(f"{'─'*90}")
     lines.append(f"  {'ID':<4} {'Farmer':<22} {'GSA':<22} {'Crop (marginal)':<22} {'Qty':>5}  {'Price':>8}")
     lines.append(f"{'─'*90}")
     lines.append(f"  SELL ORDERS (sorted by ask ↑)")
-    for s in sellers:
+    for _, fid, name, gsa, crop, qty, price in sellers:
         lines.append(
-            f"  {s['id']:<4} {s['name']:<22} {s['gsa']:<22} "
-            f"{s['marginal_crop_fallowed']:<22} {s['selling_af']:>5} AF  ${s['ask_price']:>6}/AF"
+            f"  {fid:<4} {name:<22} {gsa:<22} "
+            f"{crop:<22} {qty:>5} AF  ${price:>6}/AF"
         )
     lines.append(f"")
     lines.append(f"  BUY ORDERS (sorted by bid ↓)")
-    for b in buyers:
-        crop_key = b.get('marginal_crop_expanding', '?')
+    for _, fid, name, gsa, crop, qty, price in buyers:
         lines.append(
-            f"  {b['id']:<4} {b['name']:<22} {b['gsa']:<22} "
-            f"{crop_key:<22} {b['buying_af']:>5} AF  ${b['bid_price']:>6}/AF"
+            f"  {fid:<4} {name:<22} {gsa:<22} "
+            f"{crop:<22} {qty:>5} AF  ${price:>6}/AF"
         )
     lines.append(f"{'─'*90}")
     return "\n".join(lines)
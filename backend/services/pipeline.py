@@ -11,6 +11,10 @@ Stages:
   7. Decision Synthesis
 """
 
+import functools
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, Optional
 
 from services.stages import (
@@ -20,6 +24,39 @@ from services.stages import (
 from services.spatial_data import get_well_impact_data
 from services.transfer_llm import analyze_transfer, generate_report
 
+# Process-scope pool shared by every pipeline run — spawning a fresh
+# executor (and its worker threads) per submission costs more than the
+# stages it fans out
+_STAGE_POOL = ThreadPoolExecutor(max_workers=8)
+
+
+@functools.lru_cache(maxsize=1024)
+def _cached_well_impact(seller_lat, seller_lng, buyer_lat, buyer_lng):
+    """Memoized spatial lookup — retries and what-if reruns hit the cache."""
+    return get_well_impact_data(seller_lat, seller_lng, buyer_lat, buyer_lng)
+
+
+_ANALYSIS_CACHE: Dict[str, Dict[str, Any]] = {}
+_ANALYSIS_CACHE_MAX = 256
+
+
+def _cached_analyze_transfer(seller, buyer, transfer, stage_results, tier):
+    """Memoize LLM analysis on a content hash of its inputs."""
+    key_src = json.dumps(
+        [seller, buyer, transfer,
+         [s if isinstance(s, dict) else s.__dict__ for s in stage_results], tier],
+        sort_keys=True, default=str,
+    )
+    key = hashlib.blake2b(key_src.encode()).hexdigest()
+
+    analysis = _ANALYSIS_CACHE.get(key)
+    if analysis is None:
+        analysis = analyze_transfer(seller, buyer, transfer, stage_results, tier=tier)
+        if len(_ANALYSIS_CACHE) >= _ANALYSIS_CACHE_MAX:
+            _ANALYSIS_CACHE.pop(next(iter(_ANALYSIS_CACHE)))
+        _ANALYSIS_CACHE[key] = analysis
+    return analysis
+
 
 def run_groundwater_pipeline(
     seller: Dict[str, Any],
@@ -34,24 +71,26 @@ def run_groundwater_pipeline(
     if not r1.passed:
         return _early_deny(r1)
 
-    # Stage 2: Allocation Check
-    r2 = s2_allocation.run(seller, buyer, transfer)
-
-    # Stage 3: GSP Compliance
-    r3 = s3_gsp_compliance.run(seller, buyer, transfer, knowledge_graph=knowledge_graph)
-
-    # Stage 4: Well Impact (with spatial data)
-    spatial = get_well_impact_data(
+    # Stages 2-6 only read seller/buyer/transfer and are independent of each
+    # other (s7 consumes all results), so run them concurrently — wall time
+    # becomes the slowest stage instead of the sum. The spatial fetch is
+    # network-bound, so it is submitted first as its own task; its latency
+    # hides behind the compute stages instead of serializing ahead of s4.
+    spatial_future = _STAGE_POOL.submit(
+        _cached_well_impact,
         seller.get("well_lat"), seller.get("well_lng"),
         buyer.get("well_lat"), buyer.get("well_lng"),
     )
-    r4 = s4_well_impact.run(seller, buyer, transfer, spatial_data=spatial)
-
-    # Stage 5: Basin Health
-    r5 = s5_basin_health.run(seller, buyer, transfer)
-
-    # Stage 6: Cross-GSA
-    r6 = s6_cross_gsa.run(seller, buyer, transfer)
+    f2 = _STAGE_POOL.submit(s2_allocation.run, seller, buyer, transfer)
+    f3 = _STAGE_POOL.submit(s3_gsp_compliance.run, seller, buyer, transfer,
+                            knowledge_graph=knowledge_graph)
+    f4 = _STAGE_POOL.submit(
+        lambda: s4_well_impact.run(seller, buyer, transfer,
+                                   spatial_data=spatial_future.result())
+    )
+    f5 = _STAGE_POOL.submit(s5_basin_health.run, seller, buyer, transfer)
+    f6 = _STAGE_POOL.submit(s6_cross_gsa.run, seller, buyer, transfer)
+    r2, r3, r4, r5, r6 = f2.result(), f3.result(), f4.result(), f5.result(), f6.result()
 
     # Stage 7: Decision Synthesis
     all_stages = [r1, r2, r3, r4, r5, r6]
@@ -59,7 +98,7 @@ def run_groundwater_pipeline(
 
     # LLM analysis
     tier = "complex" if _needs_complex_review(transfer, all_stages) else "routine"
-    llm = analyze_transfer(seller, buyer, transfer, all_stages, tier=tier)
+    llm = _cached_analyze_transfer(seller, buyer, transfer, all_stages, tier)
     result["llm_analysis"] = llm
 
     # Generate report
@@ -89,13 +128,11 @@ def _early_deny(stage_result) -> Dict:
 
 
 def _needs_complex_review(transfer, stages) -> bool:
+    # Checks ordered cheapest-first, each one short-circuiting
     if transfer.get("quantity_af", 0) > 5000:
         return True
-    src = transfer.get("source_gsa", "")
-    dst = transfer.get("destination_gsa", "")
-    if src and dst and src.lower() != dst.lower():
+    src = (transfer.get("source_gsa") or "").lower()
+    dst = (transfer.get("destination_gsa") or "").lower()
+    if src and dst and src != dst:
         return True
-    for s in stages:
-        if not s.passed:
-            return True
-    return False
+    return any(not s.passed for s in stages)
@@ -6,24 +6,35 @@ sub-pipeline, then runs the appropriate stages and produces
 a unified result with pathway metadata.
 """
 
-from typing import Any, Dict, Optional
+import functools
+import hashlib
+import json
+import logging
+import queue
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 from services.regulatory_data import (
     RegulatoryPathway, determine_pathway, get_pathway_description,
     is_adjudicated_basin, get_watermaster, WATER_CODE,
 )
-from services.stages import (
-    s1_intake, s2_allocation, s3_gsp_compliance,
-    s4_well_impact, s5_basin_health, s6_cross_gsa,
-    s7_decision,
-    sw1_intake, sw2_rights_verification, sw3_no_injury,
-    sw4_environmental, sw5_conveyance,
-)
-from services.spatial_data import get_well_impact_data
-from services.transfer_llm import analyze_transfer, generate_report
+
+logger = logging.getLogger(__name__)
+
+# Stage modules and the LLM client are imported lazily inside the runners
+# that need them: routing stays cheap at import time and a cold start only
+# pays for the pathway it actually exercises (after the first call the
+# imports are just sys.modules lookups).
 
 
-PATHWAY_WEIGHTS = {
+# Read-only at runtime: each weight table is frozen so consumers can
+# share the same mapping without defensive copies
+PATHWAY_WEIGHTS = types.MappingProxyType({
+    pathway: types.MappingProxyType(weights)
+    for pathway, weights in {
     RegulatoryPathway.GW_SGMA: {
         "intake_validation": 0.10, "allocation_check": 0.15,
         "gsp_compliance": 0.25, "well_impact": 0.20,
@@ -69,6 +80,12 @@ PATHWAY_WEIGHTS = {
         "sw_intake_validation": 0.15, "sw_environmental": 0.35,
         "sw_conveyance": 0.30,
     },
+}.items()})
+
+# The same tables as tuples of (stage, weight) pairs, for consumers that
+# iterate rather than look up
+PATHWAY_WEIGHTS_ITEMS = {
+    pathway: tuple(weights.items()) for pathway, weights in PATHWAY_WEIGHTS.items()
 }
 
 
@@ -79,36 +96,61 @@ def run_routed_pipeline(
     knowledge_graph=None,
 ) -> Dict[str, Any]:
     """Route transfer to appropriate pipeline and execute it."""
+    pathway, stages, result = _evaluate_stages(seller, buyer, transfer, knowledge_graph)
+    return _finalize_result(seller, buyer, transfer, pathway, stages, result)
+
+
+# Stage evaluation is deterministic for identical inputs, and dashboards
+# re-score the same transfer within seconds (refresh, what-if reruns).
+# Cache the expensive stage runs on a content hash with a short TTL;
+# decision synthesis and the LLM step always run fresh.
+_STAGE_CACHE: Dict[str, Tuple[float, Tuple[str, list]]] = {}
+_STAGE_CACHE_MAX = 1024
+_STAGE_CACHE_TTL = 300.0
 
-    pathway = determine_pathway(seller, buyer, transfer)
-    weights = PATHWAY_WEIGHTS.get(pathway)
-
-    # Select and run the right sub-pipeline
-    if pathway in (
-        RegulatoryPathway.GW_SGMA,
-        RegulatoryPathway.GW_IN_LIEU,
-    ):
-        stages = _run_gw_sgma(seller, buyer, transfer, knowledge_graph)
-    elif pathway == RegulatoryPathway.GW_ADJUDICATED:
-        stages = _run_gw_adjudicated(seller, buyer, transfer, knowledge_graph)
-    elif pathway == RegulatoryPathway.GW_BANKED:
-        stages = _run_gw_banked(seller, buyer, transfer, knowledge_graph)
-    elif pathway == RegulatoryPathway.GW_PROTECTED_EXPORT:
-        stages = _run_gw_protected_export(seller, buyer, transfer, knowledge_graph)
-    elif pathway == RegulatoryPathway.PRE1914_PRIVATE:
-        stages = _run_pre1914(seller, buyer, transfer)
-    elif pathway == RegulatoryPathway.CONTRACT_CVP_SWP:
-        stages = _run_contract(seller, buyer, transfer)
-    elif pathway in (RegulatoryPathway.POST1914_SHORT, RegulatoryPathway.POST1914_LONG):
-        stages = _run_post1914(seller, buyer, transfer)
-    elif pathway == RegulatoryPathway.IMPORTED_WATER:
-        stages = _run_imported(seller, buyer, transfer)
+
+def _transfer_key(seller, buyer, transfer, knowledge_graph) -> str:
+    key_src = json.dumps(
+        [seller, buyer, transfer, id(knowledge_graph)],
+        sort_keys=True, default=str,
+    )
+    return hashlib.blake2b(key_src.encode()).hexdigest()
+
+
+def _evaluate_stages(
+    seller: Dict[str, Any],
+    buyer: Dict[str, Any],
+    transfer: Dict[str, Any],
+    knowledge_graph=None,
+) -> Tuple[str, list, Dict[str, Any]]:
+    """Route a transfer, run its sub-pipeline and synthesize the decision."""
+    key = _transfer_key(seller, buyer, transfer, knowledge_graph)
+    cached = _STAGE_CACHE.get(key)
+    if cached is not None and time.monotonic() - cached[0] < _STAGE_CACHE_TTL:
+        pathway, stages = cached[1]
     else:
-        stages = _run_gw_sgma(seller, buyer, transfer, knowledge_graph)
+        pathway = determine_pathway(seller, buyer, transfer)
+
+        # Select and run the right sub-pipeline via the dispatch table
+        runner = _PATHWAY_DISPATCH.get(pathway, _run_gw_sgma)
+        if runner in _KG_RUNNERS:
+            stages = runner(seller, buyer, transfer, knowledge_graph)
+        else:
+            stages = runner(seller, buyer, transfer)
+
+        if len(_STAGE_CACHE) >= _STAGE_CACHE_MAX:
+            _STAGE_CACHE.pop(next(iter(_STAGE_CACHE)))
+        _STAGE_CACHE[key] = (time.monotonic(), (pathway, stages))
+
+    from services.stages import s7_decision
+    result = s7_decision.run(stages, weights=PATHWAY_WEIGHTS.get(pathway))
+    return pathway, stages, result
+
 
-    result = s7_decision.run(stages, weights=weights)
+def _finalize_result(seller, buyer, transfer, pathway, stages, result) -> Dict[str, Any]:
+    """Attach LLM analysis, report and pathway metadata to a decision."""
+    from services.transfer_llm import analyze_transfer, generate_report
 
-    # LLM analysis
     tier = "complex" if _needs_complex(pathway, transfer) else "routine"
     llm = analyze_transfer(seller, buyer, transfer, stages, tier=tier)
     result["llm_analysis"] = llm
@@ -131,7 +173,88 @@ def run_routed_pipeline(
     return result
 
 
-def _get_legal_basis(pathway: str) -> list:
+def batch_route(
+    transfers: List[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]],
+    knowledge_graph=None,
+    llm_workers: int = 4,
+    queue_size: int = 16,
+) -> List[Dict[str, Any]]:
+    """
+    Score a batch of (seller, buyer, transfer) triples through a streaming
+    two-stage pipeline: stage evaluation feeds a bounded queue drained by a
+    pool of LLM/report workers. The LLM step is the unbalanced heavy stage,
+    so it gets `llm_workers` threads to match the evaluation rate; results
+    are written back by sequence number, so output order matches input
+    order regardless of completion order. A transfer whose evaluation or
+    finalization raises gets a per-item error record in its slot instead
+    of poisoning the rest of the batch.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(transfers)
+    eval_q: "queue.Queue" = queue.Queue(maxsize=queue_size)
+    llm_q: "queue.Queue" = queue.Queue(maxsize=queue_size)
+
+    def _error_result(exc: Exception) -> Dict[str, Any]:
+        return {
+            "decision": "ERROR",
+            "composite_score": 0.0,
+            "error": f"{type(exc).__name__}: {exc}",
+            "pipeline_type": "auto_routed",
+        }
+
+    def eval_worker():
+        try:
+            while True:
+                token = eval_q.get()
+                if token is None:
+                    return
+                seq, (seller, buyer, transfer) = token
+                try:
+                    evaluated = _evaluate_stages(
+                        seller, buyer, transfer, knowledge_graph
+                    )
+                except Exception as exc:
+                    logger.exception("batch_route: evaluation failed for item %d", seq)
+                    results[seq] = _error_result(exc)
+                    continue
+                llm_q.put((seq, (seller, buyer, transfer), evaluated))
+        finally:
+            # Shutdown must reach every LLM worker even if this loop dies,
+            # or the caller's join() blocks forever
+            for _ in range(llm_workers):
+                llm_q.put(None)
+
+    def llm_worker():
+        while True:
+            token = llm_q.get()
+            if token is None:
+                return
+            seq, (seller, buyer, transfer), (pathway, stages, result) = token
+            try:
+                results[seq] = _finalize_result(
+                    seller, buyer, transfer, pathway, stages, result
+                )
+            except Exception as exc:
+                logger.exception("batch_route: finalization failed for item %d", seq)
+                results[seq] = _error_result(exc)
+
+    workers = [threading.Thread(target=eval_worker, daemon=True)]
+    workers += [
+        threading.Thread(target=llm_worker, daemon=True) for _ in range(llm_workers)
+    ]
+    for w in workers:
+        w.start()
+    for seq, triple in enumerate(transfers):
+        eval_q.put((seq, triple))
+    eval_q.put(None)
+    for w in workers:
+        w.join()
+    return results
+
+
+@functools.lru_cache(maxsize=32)
+def _get_legal_basis(pathway: str) -> tuple:
+    # Output depends only on the pathway; cached as a tuple so the shared
+    # value cannot grow or shrink under a caller
     mapping = {
         RegulatoryPathway.GW_SGMA: ["CWC §10726.4", "SGMA §10720-10737.8"],
         RegulatoryPathway.GW_ADJUDICATED: ["Court decree", "CWC §10726.4"],
@@ -145,46 +268,30 @@ def _get_legal_basis(pathway: str) -> list:
         RegulatoryPathway.IMPORTED_WATER: ["CWC §1011"],
     }
     codes = mapping.get(pathway, [])
-    return [{"code": c, "description": WATER_CODE.get(c, c)} for c in codes]
-
+    return tuple({"code": c, "description": WATER_CODE.get(c, c)} for c in codes)
 
-def _needs_complex(pathway, transfer):
-    if pathway in (RegulatoryPathway.POST1914_LONG, RegulatoryPathway.GW_PROTECTED_EXPORT):
-        return True
-    if transfer.get("quantity_af", 0) > 5000:
-        return True
-    return False
 
+# Pathways that always warrant complex-tier LLM review
+_COMPLEX_PATHWAYS = frozenset({
+    RegulatoryPathway.POST1914_LONG, RegulatoryPathway.GW_PROTECTED_EXPORT,
+})
 
-# ── Sub-pipeline runners ────────────────────────────────────
 
-def _run_gw_sgma(seller, buyer, transfer, kg=None):
-    r1 = s1_intake.run(seller, buyer, transfer)
-    r2 = s2_allocation.run(seller, buyer, transfer)
-    r3 = s3_gsp_compliance.run(seller, buyer, transfer, knowledge_graph=kg)
-    spatial = get_well_impact_data(
-        seller.get("well_lat"), seller.get("well_lng"),
-        buyer.get("well_lat"), buyer.get("well_lng"),
-    )
-    r4 = s4_well_impact.run(seller, buyer, transfer, spatial_data=spatial)
-    r5 = s5_basin_health.run(seller, buyer, transfer)
-    r6 = s6_cross_gsa.run(seller, buyer, transfer)
-    return [r1, r2, r3, r4, r5, r6]
+def _needs_complex(pathway, transfer):
+    return pathway in _COMPLEX_PATHWAYS or transfer.get("quantity_af", 0) > 5000
 
 
-def _run_gw_adjudicated(seller, buyer, transfer, kg=None):
-    r1 = s1_intake.run(seller, buyer, transfer)
-    r2 = s2_allocation.run(seller, buyer, transfer)
-    spatial = get_well_impact_data(
-        seller.get("well_lat"), seller.get("well_lng"),
-        buyer.get("well_lat"), buyer.get("well_lng"),
-    )
-    r4 = s4_well_impact.run(seller, buyer, transfer, spatial_data=spatial)
-    r5 = s5_basin_health.run(seller, buyer, transfer)
+# ── Static stage results ────────────────────────────────────
+#
+# Several pathways attach an effectively-constant StageResult (only the
+# adjudicated watermaster varies). Build each once on first use and share
+# it: downstream consumers only read these, never mutate them. The
+# factories import StageResult lazily so the router module stays light.
 
-    wm = get_watermaster(seller.get("basin", ""))
+@functools.lru_cache(maxsize=32)
+def _adjudicated_stage(wm):
     from services.stages.base import StageResult
-    adj_stage = StageResult(
+    return StageResult(
         stage="adjudicated_basin",
         passed=True,
         score=0.85,
@@ -196,35 +303,12 @@ def _run_gw_adjudicated(seller, buyer, transfer, kg=None):
         ],
         data={"watermaster": wm, "adjudicated": True},
     )
-    return [r1, r2, adj_stage, r4, r5]
-
-
-def _run_gw_banked(seller, buyer, transfer, kg=None):
-    r1 = s1_intake.run(seller, buyer, transfer)
-    r2 = s2_allocation.run(seller, buyer, transfer)
-    spatial = get_well_impact_data(
-        seller.get("well_lat"), seller.get("well_lng"),
-        buyer.get("well_lat"), buyer.get("well_lng"),
-    )
-    r4 = s4_well_impact.run(seller, buyer, transfer, spatial_data=spatial)
-    r5 = s5_basin_health.run(seller, buyer, transfer)
-    return [r1, r2, r4, r5]
-
 
-def _run_gw_protected_export(seller, buyer, transfer, kg=None):
-    r1 = s1_intake.run(seller, buyer, transfer)
-    r2 = s2_allocation.run(seller, buyer, transfer)
-    r3 = s3_gsp_compliance.run(seller, buyer, transfer, knowledge_graph=kg)
-    spatial = get_well_impact_data(
-        seller.get("well_lat"), seller.get("well_lng"),
-        buyer.get("well_lat"), buyer.get("well_lng"),
-    )
-    r4 = s4_well_impact.run(seller, buyer, transfer, spatial_data=spatial)
-    r5 = s5_basin_health.run(seller, buyer, transfer)
-    r6 = s6_cross_gsa.run(seller, buyer, transfer)
 
+@functools.lru_cache(maxsize=1)
+def _protected_export_stage():
     from services.stages.base import StageResult
-    export_stage = StageResult(
+    return StageResult(
         stage="protected_export_review",
         passed=False,
         score=0.20,
@@ -240,17 +324,12 @@ def _run_gw_protected_export(seller, buyer, transfer, kg=None):
         ],
         data={"legal_basis": "CWC §1215-1220"},
     )
-    return [r1, r2, r3, r4, r5, r6, export_stage]
-
 
-def _run_pre1914(seller, buyer, transfer):
-    r1 = sw1_intake.run(seller, buyer, transfer)
-    r3 = sw3_no_injury.run(seller, buyer, transfer)
-    r4 = sw4_environmental.run(seller, buyer, transfer)
-    r5 = sw5_conveyance.run(seller, buyer, transfer)
 
+@functools.lru_cache(maxsize=1)
+def _pre1914_stage():
     from services.stages.base import StageResult
-    pre1914_stage = StageResult(
+    return StageResult(
         stage="pre1914_verification",
         passed=True,
         score=0.90,
@@ -262,33 +341,12 @@ def _run_pre1914(seller, buyer, transfer):
         ],
         data={"swrcb_approval_needed": False, "legal_basis": "Pre-1914 common law"},
     )
-    return [r1, pre1914_stage, r3, r4, r5]
 
 
-def _run_contract(seller, buyer, transfer):
-    r1 = sw1_intake.run(seller, buyer, transfer)
-    r2 = sw2_rights_verification.run(seller, buyer, transfer)
-    r4 = sw4_environmental.run(seller, buyer, transfer)
-    r5 = sw5_conveyance.run(seller, buyer, transfer)
-    return [r1, r2, r4, r5]
-
-
-def _run_post1914(seller, buyer, transfer):
-    r1 = sw1_intake.run(seller, buyer, transfer)
-    r2 = sw2_rights_verification.run(seller, buyer, transfer)
-    r3 = sw3_no_injury.run(seller, buyer, transfer)
-    r4 = sw4_environmental.run(seller, buyer, transfer)
-    r5 = sw5_conveyance.run(seller, buyer, transfer)
-    return [r1, r2, r3, r4, r5]
-
-
-def _run_imported(seller, buyer, transfer):
-    r1 = sw1_intake.run(seller, buyer, transfer)
-    r4 = sw4_environmental.run(seller, buyer, transfer)
-    r5 = sw5_conveyance.run(seller, buyer, transfer)
-
+@functools.lru_cache(maxsize=1)
+def _imported_water_stage():
     from services.stages.base import StageResult
-    imported_stage = StageResult(
+    return StageResult(
         stage="imported_water_review",
         passed=True,
         score=0.90,
@@ -297,4 +355,169 @@ def _run_imported(seller, buyer, transfer):
         conditions=["Verify water was legally imported and stored"],
         data={"legal_basis": "CWC §1011"},
     )
-    return [r1, imported_stage, r4, r5]
+
+
+# ── Sub-pipeline runners ────────────────────────────────────
+#
+# The stages within each runner only read seller/buyer/transfer and are
+# independent of each other, so every runner submits them to a shared
+# pool and collects results in the original order — wall time per
+# transfer drops to the slowest stage. The spatial fetch is submitted
+# first so its network latency hides behind the compute stages; s4 is
+# chained on it.
+
+_STAGE_POOL = ThreadPoolExecutor(max_workers=8)
+
+
+@functools.lru_cache(maxsize=2048)
+def _cached_well_impact(s_lat, s_lng, b_lat, b_lng):
+    """Memoized spatial lookup shared by every groundwater runner."""
+    from services.spatial_data import get_well_impact_data
+    return get_well_impact_data(s_lat, s_lng, b_lat, b_lng)
+
+
+def _round_coord(value):
+    # ~1 m precision: improves cache hit rate without spatial meaning loss
+    return round(value, 5) if isinstance(value, (int, float)) else value
+
+
+def _fetch_spatial(seller, buyer):
+    return _cached_well_impact(
+        _round_coord(seller.get("well_lat")), _round_coord(seller.get("well_lng")),
+        _round_coord(buyer.get("well_lat")), _round_coord(buyer.get("well_lng")),
+    )
+
+
+def _run_gw_sgma(seller, buyer, transfer, kg=None):
+    from services.stages import (
+        s1_intake, s2_allocation, s3_gsp_compliance,
+        s4_well_impact, s5_basin_health, s6_cross_gsa,
+    )
+    spatial_future = _STAGE_POOL.submit(_fetch_spatial, seller, buyer)
+    f1 = _STAGE_POOL.submit(s1_intake.run, seller, buyer, transfer)
+    f2 = _STAGE_POOL.submit(s2_allocation.run, seller, buyer, transfer)
+    f3 = _STAGE_POOL.submit(s3_gsp_compliance.run, seller, buyer, transfer,
+                            knowledge_graph=kg)
+    f4 = _STAGE_POOL.submit(
+        lambda: s4_well_impact.run(seller, buyer, transfer,
+                                   spatial_data=spatial_future.result())
+    )
+    f5 = _STAGE_POOL.submit(s5_basin_health.run, seller, buyer, transfer)
+    f6 = _STAGE_POOL.submit(s6_cross_gsa.run, seller, buyer, transfer)
+    return [f1.result(), f2.result(), f3.result(), f4.result(), f5.result(), f6.result()]
+
+
+def _run_gw_adjudicated(seller, buyer, transfer, kg=None):
+    from services.stages import (
+        s1_intake, s2_allocation, s4_well_impact, s5_basin_health,
+    )
+    spatial_future = _STAGE_POOL.submit(_fetch_spatial, seller, buyer)
+    f1 = _STAGE_POOL.submit(s1_intake.run, seller, buyer, transfer)
+    f2 = _STAGE_POOL.submit(s2_allocation.run, seller, buyer, transfer)
+    f4 = _STAGE_POOL.submit(
+        lambda: s4_well_impact.run(seller, buyer, transfer,
+                                   spatial_data=spatial_future.result())
+    )
+    f5 = _STAGE_POOL.submit(s5_basin_health.run, seller, buyer, transfer)
+
+    adj_stage = _adjudicated_stage(get_watermaster(seller.get("basin", "")))
+    return [f1.result(), f2.result(), adj_stage, f4.result(), f5.result()]
+
+
+def _run_gw_banked(seller, buyer, transfer, kg=None):
+    from services.stages import (
+        s1_intake, s2_allocation, s4_well_impact, s5_basin_health,
+    )
+    spatial_future = _STAGE_POOL.submit(_fetch_spatial, seller, buyer)
+    f1 = _STAGE_POOL.submit(s1_intake.run, seller, buyer, transfer)
+    f2 = _STAGE_POOL.submit(s2_allocation.run, seller, buyer, transfer)
+    f4 = _STAGE_POOL.submit(
+        lambda: s4_well_impact.run(seller, buyer, transfer,
+                                   spatial_data=spatial_future.result())
+    )
+    f5 = _STAGE_POOL.submit(s5_basin_health.run, seller, buyer, transfer)
+    return [f1.result(), f2.result(), f4.result(), f5.result()]
+
+
+def _run_gw_protected_export(seller, buyer, transfer, kg=None):
+    from services.stages import (
+        s1_intake, s2_allocation, s3_gsp_compliance,
+        s4_well_impact, s5_basin_health, s6_cross_gsa,
+    )
+    spatial_future = _STAGE_POOL.submit(_fetch_spatial, seller, buyer)
+    f1 = _STAGE_POOL.submit(s1_intake.run, seller, buyer, transfer)
+    f2 = _STAGE_POOL.submit(s2_allocation.run, seller, buyer, transfer)
+    f3 = _STAGE_POOL.submit(s3_gsp_compliance.run, seller, buyer, transfer,
+                            knowledge_graph=kg)
+    f4 = _STAGE_POOL.submit(
+        lambda: s4_well_impact.run(seller, buyer, transfer,
+                                   spatial_data=spatial_future.result())
+    )
+    f5 = _STAGE_POOL.submit(s5_basin_health.run, seller, buyer, transfer)
+    f6 = _STAGE_POOL.submit(s6_cross_gsa.run, seller, buyer, transfer)
+
+    return [f1.result(), f2.result(), f3.result(), f4.result(),
+            f5.result(), f6.result(), _protected_export_stage()]
+
+
+def _run_pre1914(seller, buyer, transfer):
+    from services.stages import sw1_intake, sw3_no_injury, sw4_environmental, sw5_conveyance
+    f1 = _STAGE_POOL.submit(sw1_intake.run, seller, buyer, transfer)
+    f3 = _STAGE_POOL.submit(sw3_no_injury.run, seller, buyer, transfer)
+    f4 = _STAGE_POOL.submit(sw4_environmental.run, seller, buyer, transfer)
+    f5 = _STAGE_POOL.submit(sw5_conveyance.run, seller, buyer, transfer)
+
+    return [f1.result(), _pre1914_stage(), f3.result(), f4.result(), f5.result()]
+
+
+def _run_contract(seller, buyer, transfer):
+    from services.stages import (
+        sw1_intake, sw2_rights_verification, sw4_environmental, sw5_conveyance,
+    )
+    f1 = _STAGE_POOL.submit(sw1_intake.run, seller, buyer, transfer)
+    f2 = _STAGE_POOL.submit(sw2_rights_verification.run, seller, buyer, transfer)
+    f4 = _STAGE_POOL.submit(sw4_environmental.run, seller, buyer, transfer)
+    f5 = _STAGE_POOL.submit(sw5_conveyance.run, seller, buyer, transfer)
+    return [f1.result(), f2.result(), f4.result(), f5.result()]
+
+
+def _run_post1914(seller, buyer, transfer):
+    from services.stages import (
+        sw1_intake, sw2_rights_verification, sw3_no_injury,
+        sw4_environmental, sw5_conveyance,
+    )
+    f1 = _STAGE_POOL.submit(sw1_intake.run, seller, buyer, transfer)
+    f2 = _STAGE_POOL.submit(sw2_rights_verification.run, seller, buyer, transfer)
+    f3 = _STAGE_POOL.submit(sw3_no_injury.run, seller, buyer, transfer)
+    f4 = _STAGE_POOL.submit(sw4_environmental.run, seller, buyer, transfer)
+    f5 = _STAGE_POOL.submit(sw5_conveyance.run, seller, buyer, transfer)
+    return [f1.result(), f2.result(), f3.result(), f4.result(), f5.result()]
+
+
+def _run_imported(seller, buyer, transfer):
+    from services.stages import sw1_intake, sw4_environmental, sw5_conveyance
+    f1 = _STAGE_POOL.submit(sw1_intake.run, seller, buyer, transfer)
+    f4 = _STAGE_POOL.submit(sw4_environmental.run, seller, buyer, transfer)
+    f5 = _STAGE_POOL.submit(sw5_conveyance.run, seller, buyer, transfer)
+
+    return [f1.result(), _imported_water_stage(), f4.result(), f5.result()]
+
+
+# Pathway → runner dispatch table (defined after the runners). Groundwater
+# runners additionally take the knowledge graph.
+_PATHWAY_DISPATCH = {
+    RegulatoryPathway.GW_SGMA: _run_gw_sgma,
+    RegulatoryPathway.GW_IN_LIEU: _run_gw_sgma,
+    RegulatoryPathway.GW_ADJUDICATED: _run_gw_adjudicated,
+    RegulatoryPathway.GW_BANKED: _run_gw_banked,
+    RegulatoryPathway.GW_PROTECTED_EXPORT: _run_gw_protected_export,
+    RegulatoryPathway.PRE1914_PRIVATE: _run_pre1914,
+    RegulatoryPathway.CONTRACT_CVP_SWP: _run_contract,
+    RegulatoryPathway.POST1914_SHORT: _run_post1914,
+    RegulatoryPathway.POST1914_LONG: _run_post1914,
+    RegulatoryPathway.IMPORTED_WATER: _run_imported,
+}
+
+_KG_RUNNERS = frozenset({
+    _run_gw_sgma, _run_gw_adjudicated, _run_gw_banked, _run_gw_protected_export,
+})
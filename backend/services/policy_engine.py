@@ -4,11 +4,37 @@ Loads real policy text from Kern County GSP and SGMA statute,
 chunks it for retrieval, and provides policy-aware compliance analysis.
 """
 
+import heapq
 import json
 import os
-from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Set, Tuple
 from pathlib import Path
 
+import numpy as np
+
+try:
+    import ahocorasick  # pyahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _load_json(path: str):
+    """Parse a JSON file, preferring orjson when available."""
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path) as f:
+        return json.load(f)
+
+
+_TOKEN_STRIP = '.,;:()[]"\'!?'
+
 
 class PolicyChunk:
     """A chunk of policy text with metadata."""
@@ -17,6 +43,11 @@ class PolicyChunk:
         self.source = source
         self.page = page
         self.category = category  # e.g. "sustainability_criteria", "water_budget", "transfer", "monitoring"
+        # Derived once at load so retrieval never re-lowers or re-splits
+        self.text_lower = text.lower()
+        self.tokens = frozenset(
+            w.strip(_TOKEN_STRIP) for w in self.text_lower.split()
+        )
 
     def to_dict(self) -> dict:
         return {
@@ -91,6 +122,51 @@ class PolicyEngine:
         self.sgma_chunks: List[PolicyChunk] = []
         self.all_chunks: List[PolicyChunk] = []
         self.category_index: Dict[str, List[PolicyChunk]] = {}
+        self._vocab: Dict[str, int] = {}
+        self._tf: Optional[np.ndarray] = None
+        self._cat_onehot: Optional[np.ndarray] = None
+        self._cat_ids: Dict[str, int] = {}
+        self._postings: Dict[str, List[int]] = {}
+        self._cat_members: Dict[str, List[int]] = {}
+
+        # Reverse keyword → categories map, flattened once: a keyword can
+        # sit in several categories ("groundwater extraction" is both
+        # water_budget and transfer). This is what both the automaton and
+        # the fallback scan iterate, so each keyword is visited exactly once
+        keyword_cats: Dict[str, List[str]] = {}
+        for cat, keywords in self.CATEGORY_KEYWORDS.items():
+            for kw in keywords:
+                keyword_cats.setdefault(kw, []).append(cat)
+        self._keyword_cats: Dict[str, Tuple[str, ...]] = {
+            kw: tuple(cats) for kw, cats in keyword_cats.items()
+        }
+
+        # One Aho-Corasick automaton over all keywords: a single pass over
+        # the text finds every keyword instead of ~70 substring searches
+        self._automaton = None
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for kw in self._keyword_cats:
+                self._automaton.add_word(kw, kw)
+            self._automaton.make_automaton()
+
+        # Keyword → row of category indicators, so per-category counting is
+        # one integer matrix row-sum instead of nested dict updates
+        self._kw_ids = {kw: i for i, kw in enumerate(self._keyword_cats)}
+        self._cat_order = list(self.CATEGORY_KEYWORDS)
+        cat_pos = {cat: i for i, cat in enumerate(self._cat_order)}
+        self._kw_cat_matrix = np.zeros(
+            (len(self._kw_ids), len(self._cat_order)), dtype=np.int32
+        )
+        for kw, cats in self._keyword_cats.items():
+            for cat in cats:
+                self._kw_cat_matrix[self._kw_ids[kw], cat_pos[cat]] = 1
+
+    def _keyword_hits(self, text_lower: str) -> Set[str]:
+        """Set of category keywords present in the text (single scan)."""
+        if self._automaton is not None:
+            return {kw for _, kw in self._automaton.iter(text_lower)}
+        return {kw for kw in self._keyword_cats if kw in text_lower}
 
     def load_policies(self, data_dir: str = None):
         """Load pre-extracted policy chunks from JSON files."""
@@ -100,34 +176,17 @@ class PolicyEngine:
         gsp_path = os.path.join(data_dir, "kern_gsp_chunks.json")
         sgma_path = os.path.join(data_dir, "sgma_statute_chunks.json")
 
-        if os.path.exists(gsp_path):
-            with open(gsp_path) as f:
-                raw = json.load(f)
-            for item in raw:
-                cat = self._categorize(item["text"])
-                chunk = PolicyChunk(
-                    text=item["text"],
-                    source=item["source"],
-                    page=item["page"],
-                    category=cat
-                )
-                self.gsp_chunks.append(chunk)
-
-        if os.path.exists(sgma_path):
-            with open(sgma_path) as f:
-                raw = json.load(f)
-            for item in raw:
-                cat = self._categorize(item["text"])
-                chunk = PolicyChunk(
-                    text=item["text"],
-                    source=item["source"],
-                    page=item["page"],
-                    category=cat
-                )
-                self.sgma_chunks.append(chunk)
+        # Parse and categorize the two corpora concurrently — each file's
+        # read/parse overlaps the other's categorization pass
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            gsp_future = executor.submit(self._load_chunk_file, gsp_path)
+            sgma_future = executor.submit(self._load_chunk_file, sgma_path)
+            self.gsp_chunks = gsp_future.result()
+            self.sgma_chunks = sgma_future.result()
 
         self.all_chunks = self.gsp_chunks + self.sgma_chunks
         self._build_category_index()
+        self._build_score_matrices()
 
         return {
             "gsp_chunks": len(self.gsp_chunks),
@@ -136,17 +195,42 @@ class PolicyEngine:
             "categories": {k: len(v) for k, v in self.category_index.items()}
         }
 
+    def _load_chunk_file(self, path: str) -> List[PolicyChunk]:
+        """Parse one chunk file and categorize its chunks."""
+        if not os.path.exists(path):
+            return []
+        return [
+            PolicyChunk(
+                text=item["text"],
+                source=item["source"],
+                page=item["page"],
+                category=self._categorize(item["text"]),
+            )
+            for item in _load_json(path)
+        ]
+
+    def _category_counts(self, text_lower: str) -> np.ndarray:
+        """Per-category keyword counts (declaration order) in one pass."""
+        hits = self._keyword_hits(text_lower)
+        if not hits:
+            return np.zeros(len(self._cat_order), dtype=np.int32)
+        rows = [self._kw_ids[kw] for kw in hits]
+        return self._kw_cat_matrix[rows].sum(axis=0)
+
+    def _category_scores(self, text_lower: str) -> Dict[str, int]:
+        """Per-category count of matched keywords, as a dict of nonzeros."""
+        counts = self._category_counts(text_lower)
+        return {
+            self._cat_order[i]: int(counts[i]) for i in np.nonzero(counts)[0]
+        }
+
     def _categorize(self, text: str) -> str:
         """Classify a chunk into the most relevant category."""
-        text_lower = text.lower()
-        best_cat = "general"
-        best_score = 0
-        for cat, keywords in self.CATEGORY_KEYWORDS.items():
-            score = sum(1 for kw in keywords if kw in text_lower)
-            if score > best_score:
-                best_score = score
-                best_cat = cat
-        return best_cat
+        counts = self._category_counts(text.lower())
+        # argmax returns the first maximum, matching the old
+        # declaration-order tie-break
+        best = int(counts.argmax())
+        return self._cat_order[best] if counts[best] > 0 else "general"
 
     def _build_category_index(self):
         """Index chunks by category for fast retrieval."""
@@ -156,35 +240,101 @@ class PolicyEngine:
                 self.category_index[chunk.category] = []
             self.category_index[chunk.category].append(chunk)
 
+    def _build_score_matrices(self):
+        """
+        Build a binary term-incidence matrix (chunks × vocab) and a one-hot
+        category matrix so retrieval scoring reduces to NumPy column sums
+        instead of a Python loop over every chunk.
+        """
+        self._vocab: Dict[str, int] = {}
+        for chunk in self.all_chunks:
+            for token in chunk.tokens:
+                # Query tokens shorter than 4 chars never score
+                if len(token) > 3 and token not in self._vocab:
+                    self._vocab[token] = len(self._vocab)
+
+        self._cat_ids = {cat: i for i, cat in enumerate(self.CATEGORY_KEYWORDS)}
+        self._cat_ids["general"] = len(self._cat_ids)
+
+        n = len(self.all_chunks)
+        self._tf = np.zeros((n, len(self._vocab)), dtype=np.uint8)
+        self._cat_onehot = np.zeros((n, len(self._cat_ids)), dtype=np.int32)
+        self._postings: Dict[str, List[int]] = {}
+        self._cat_members: Dict[str, List[int]] = {}
+        for i, chunk in enumerate(self.all_chunks):
+            for token in chunk.tokens:
+                col = self._vocab.get(token)
+                if col is not None:
+                    self._tf[i, col] = 1
+                    self._postings.setdefault(token, []).append(i)
+            self._cat_onehot[i, self._cat_ids[chunk.category]] = 1
+            self._cat_members.setdefault(chunk.category, []).append(i)
+
     def retrieve_for_question(self, question: str, top_k: int = 5) -> List[PolicyChunk]:
         """
         Retrieve the most relevant policy chunks for a compliance question.
         Uses keyword-based relevance scoring (a real system would use embeddings).
         """
         question_lower = question.lower()
-        scored = []
+        q_category_scores = self._category_scores(question_lower)
+        q_tokens = frozenset(
+            w for w in (t.strip(_TOKEN_STRIP) for t in question_lower.split())
+            if len(w) > 3
+        )
 
-        for chunk in self.all_chunks:
-            score = 0
-            chunk_lower = chunk.text.lower()
-
-            # Score based on keyword overlap with the question
-            words = set(question_lower.split())
-            for word in words:
-                if len(word) > 3 and word in chunk_lower:
-                    score += 1
-
-            # Boost for category match
-            for cat, keywords in self.CATEGORY_KEYWORDS.items():
-                q_relevance = sum(1 for kw in keywords if kw in question_lower)
-                if q_relevance > 0 and chunk.category == cat:
+        if self._tf is not None:
+            # Candidate set from the inverted index: only chunks sharing a
+            # question token or sitting in a boosted category can score
+            cand = set()
+            for w in q_tokens:
+                cand.update(self._postings.get(w, ()))
+            for cat in q_category_scores:
+                cand.update(self._cat_members.get(cat, ()))
+
+            if len(cand) > len(self.all_chunks) // 2:
+                # Broad question — the dense matvec beats per-chunk work
+                cols = [self._vocab[w] for w in q_tokens if w in self._vocab]
+                scores = (
+                    self._tf[:, cols].sum(axis=1, dtype=np.int32)
+                    if cols else np.zeros(len(self.all_chunks), dtype=np.int32)
+                )
+                boost = np.zeros(len(self._cat_ids), dtype=np.int32)
+                for cat, q_relevance in q_category_scores.items():
+                    boost[self._cat_ids[cat]] = q_relevance * 3  # Strong category boost
+                scores = scores + self._cat_onehot @ boost
+                scored = [
+                    (int(scores[i]), self.all_chunks[i])
+                    for i in np.nonzero(scores > 0)[0]
+                ]
+            else:
+                # Narrow question — score only the candidates, in chunk
+                # order so equal-score ties resolve as before
+                scored = []
+                for i in sorted(cand):
+                    chunk = self.all_chunks[i]
+                    score = (
+                        len(q_tokens & chunk.tokens)
+                        + q_category_scores.get(chunk.category, 0) * 3
+                    )
+                    if score > 0:
+                        scored.append((score, chunk))
+        else:
+            scored = []
+            for chunk in self.all_chunks:
+                # Score based on keyword overlap with the question
+                score = len(q_tokens & chunk.tokens)
+
+                # Boost for category match
+                q_relevance = q_category_scores.get(chunk.category, 0)
+                if q_relevance > 0:
                     score += q_relevance * 3  # Strong category boost
 
-            if score > 0:
-                scored.append((score, chunk))
+                if score > 0:
+                    scored.append((score, chunk))
 
-        scored.sort(key=lambda x: x[0], reverse=True)
-        return [chunk for _, chunk in scored[:top_k]]
+        # Only top_k winners matter — bounded heap instead of a full sort
+        top = heapq.nlargest(top_k, scored, key=lambda x: x[0])
+        return [chunk for _, chunk in top]
 
     def retrieve_by_categories(self, categories: List[str], max_per_cat: int = 3) -> List[PolicyChunk]:
         """Retrieve chunks from specific categories."""
@@ -11,11 +11,18 @@ Defines 10+ regulatory pathways and implements the decision tree
 to route transfers to the correct pathway.
 """
 
+import functools
 import json
 import logging
+import threading
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 logger = logging.getLogger(__name__)
 
 DATA_DIR = Path(__file__).parent.parent / "data"
@@ -147,6 +154,13 @@ def get_pathway_description(pathway: str) -> str:
 # ══════════════════════════════════════════════════════════════
 
 _adjudicated_basins_cache = None
+_adjudicated_basins_lock = threading.Lock()
+
+# Lookup structures derived from the GeoJSON once at load:
+# lowercased basin name → watermaster for O(1) exact hits, plus the same
+# pairs as a list for the bidirectional-substring fallback
+_ADJ_NAME_TO_WATERMASTER: Dict[str, Optional[str]] = {}
+_ADJ_NAME_SUBSTRINGS: List[Tuple[str, Optional[str]]] = []
 
 
 def _load_adjudicated_basins() -> List[Dict]:
@@ -154,46 +168,78 @@ def _load_adjudicated_basins() -> List[Dict]:
     if _adjudicated_basins_cache is not None:
         return _adjudicated_basins_cache
 
-    geojson_path = DATA_DIR / "adjudicated_basins.geojson"
-    if not geojson_path.exists():
-        logger.warning("Adjudicated basins GeoJSON not found at %s", geojson_path)
-        _adjudicated_basins_cache = []
-        return []
-
-    try:
-        with open(geojson_path) as f:
-            data = json.load(f)
-        features = data.get("features", [])
-        _adjudicated_basins_cache = features
-        logger.info("Loaded %d adjudicated basin features", len(features))
-        return features
-    except Exception as exc:
-        logger.warning("Failed to load adjudicated basins: %s", exc)
-        _adjudicated_basins_cache = []
-        return []
+    # Double-checked under a lock: the router's stage pool can send several
+    # threads here on a cold start, and the file must parse (and the index
+    # build) exactly once
+    with _adjudicated_basins_lock:
+        if _adjudicated_basins_cache is not None:
+            return _adjudicated_basins_cache
+
+        geojson_path = DATA_DIR / "adjudicated_basins.geojson"
+        if not geojson_path.exists():
+            logger.warning("Adjudicated basins GeoJSON not found at %s", geojson_path)
+            _adjudicated_basins_cache = []
+            return []
+
+        try:
+            # Only properties are ever read — stream them out and discard
+            # the (much larger) geometry without materializing it
+            if ijson is not None:
+                with open(geojson_path, "rb") as f:
+                    features = [
+                        {"properties": props}
+                        for props in ijson.items(f, "features.item.properties")
+                    ]
+            else:
+                with open(geojson_path) as f:
+                    data = json.load(f)
+                features = data.get("features", [])
+            _build_adjudicated_index(features)
+            logger.info("Loaded %d adjudicated basin features", len(features))
+            _adjudicated_basins_cache = features
+            return features
+        except Exception as exc:
+            logger.warning("Failed to load adjudicated basins: %s", exc)
+            _adjudicated_basins_cache = []
+            return []
+
+
+def _build_adjudicated_index(features: List[Dict]):
+    """Lowercase every basin name once so lookups never rescan features."""
+    for f in features:
+        props = f.get("properties", {})
+        adj_name = (props.get("AdjBasinName") or props.get("Basin_Name") or "").lower()
+        if not adj_name:
+            continue
+        watermaster = props.get("Watermaster") or props.get("watermaster")
+        if adj_name not in _ADJ_NAME_TO_WATERMASTER:
+            _ADJ_NAME_TO_WATERMASTER[adj_name] = watermaster
+            _ADJ_NAME_SUBSTRINGS.append((adj_name, watermaster))
 
 
+@functools.lru_cache(maxsize=1024)
 def is_adjudicated_basin(basin_name: str) -> bool:
     """Check if a basin is adjudicated based on DWR data."""
-    features = _load_adjudicated_basins()
+    _load_adjudicated_basins()
     basin_lower = basin_name.lower()
-    for f in features:
-        props = f.get("properties", {})
-        adj_name = (props.get("AdjBasinName") or props.get("Basin_Name") or "").lower()
-        if adj_name and (adj_name in basin_lower or basin_lower in adj_name):
-            return True
-    return False
+    if basin_lower in _ADJ_NAME_TO_WATERMASTER:
+        return True
+    return any(
+        adj_name in basin_lower or basin_lower in adj_name
+        for adj_name, _ in _ADJ_NAME_SUBSTRINGS
+    )
 
 
+@functools.lru_cache(maxsize=1024)
 def get_watermaster(basin_name: str) -> Optional[str]:
     """Get the watermaster for an adjudicated basin."""
-    features = _load_adjudicated_basins()
+    _load_adjudicated_basins()
     basin_lower = basin_name.lower()
-    for f in features:
-        props = f.get("properties", {})
-        adj_name = (props.get("AdjBasinName") or props.get("Basin_Name") or "").lower()
-        if adj_name and (adj_name in basin_lower or basin_lower in adj_name):
-            return props.get("Watermaster") or props.get("watermaster")
+    if basin_lower in _ADJ_NAME_TO_WATERMASTER:
+        return _ADJ_NAME_TO_WATERMASTER[basin_lower]
+    for adj_name, watermaster in _ADJ_NAME_SUBSTRINGS:
+        if adj_name in basin_lower or basin_lower in adj_name:
+            return watermaster
     return None
 
 
@@ -205,13 +251,27 @@ def determine_pathway(seller: dict, buyer: dict, transfer: dict) -> str:
     """
     Implement the SWRCB Water Transfer Decision Tree to route
     a transfer to the correct regulatory pathway.
-    """
-    source = transfer.get("source_type", "").lower()
-    ttype = transfer.get("transfer_type", "").lower()
-    right_type = seller.get("water_right_type", "").lower()
-    basin = seller.get("basin", "")
-    duration = transfer.get("duration_days", 365)
 
+    Extracts and normalizes the routing fields, then delegates to a
+    memoized helper — the same handful of field combinations repeats
+    constantly on re-scoring and dashboard loads.
+    """
+    return _determine_pathway_cached(
+        transfer.get("source_type", "").lower(),
+        transfer.get("transfer_type", "").lower(),
+        seller.get("water_right_type", "").lower(),
+        seller.get("basin", ""),
+        (transfer.get("source_basin") or seller.get("basin") or "").lower(),
+        (transfer.get("destination_basin") or buyer.get("basin") or "").lower(),
+        transfer.get("duration_days", 365),
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def _determine_pathway_cached(
+    source: str, ttype: str, right_type: str,
+    basin: str, src_basin_lc: str, dst_basin_lc: str, duration: int,
+) -> str:
     # ── Groundwater paths ──
     if source == "groundwater" or ttype in ("direct", "in_lieu", "banked"):
         if ttype == "banked":
@@ -224,9 +284,7 @@ def determine_pathway(seller: dict, buyer: dict, transfer: dict) -> str:
             return RegulatoryPathway.GW_ADJUDICATED
 
         # Check if export from protected area
-        src_basin = transfer.get("source_basin", seller.get("basin", ""))
-        dst_basin = transfer.get("destination_basin", buyer.get("basin", ""))
-        if src_basin and dst_basin and src_basin.lower() != dst_basin.lower():
+        if src_basin_lc and dst_basin_lc and src_basin_lc != dst_basin_lc:
             return RegulatoryPathway.GW_PROTECTED_EXPORT
 
         return RegulatoryPathway.GW_SGMA
@@ -4,16 +4,45 @@ data from DWR public APIs and local GeoJSON caches.
 """
 
 import json
-import math
 import logging
+import math
+import pickle
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 from functools import lru_cache
 
+import numpy as np
 import requests
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from services.geo_kernels import haversine_mi, haversine_mi_arr
+
 logger = logging.getLogger(__name__)
 
+# Shared session with a connection pool: repeated DWR queries reuse the
+# same TLS connection instead of paying the handshake on every call
+_session = requests.Session()
+_session.headers.update({"Accept": "application/json"})
+_adapter = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=2, backoff_factor=0.2),
+)
+_session.mount("https://", _adapter)
+_session.mount("http://", _adapter)
+
+# Small pool for issuing the seller and buyer DWR queries concurrently —
+# the two fetches are independent and each spends its time waiting on the
+# network
+_FETCH_POOL = ThreadPoolExecutor(max_workers=2)
+
 DATA_DIR = Path(__file__).parent.parent / "data"
 MONITORING_DIR = DATA_DIR.parent.parent / "data" / "monitoring"
 
@@ -28,14 +57,35 @@ DWR_CASGEM_URL = (
 )
 
 
-def haversine_mi(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    R = 3958.8
-    dlat = math.radians(lat2 - lat1)
-    dlon = math.radians(lon2 - lon1)
-    a = (math.sin(dlat / 2) ** 2 +
-         math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) *
-         math.sin(dlon / 2) ** 2)
-    return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+def _load_or_build(src_path: Path, pkl_path: Path, builder):
+    """
+    Load a pickled representation of a parsed data file, rebuilding it when
+    the source is newer than the pickle (or the pickle is missing/corrupt).
+    The pickle write is best-effort — a read-only data dir just means the
+    parse happens on every cold start, as before.
+    """
+    try:
+        if pkl_path.exists() and pkl_path.stat().st_mtime >= src_path.stat().st_mtime:
+            with open(pkl_path, "rb") as f:
+                return pickle.load(f)
+    except Exception as exc:
+        logger.warning("Ignoring stale/corrupt pickle cache %s: %s", pkl_path, exc)
+
+    result = builder(src_path)
+    try:
+        with open(pkl_path, "wb") as f:
+            pickle.dump(result, f, protocol=5)
+    except OSError as exc:
+        logger.warning("Could not write pickle cache %s: %s", pkl_path, exc)
+    return result
+
+
+def _read_json(path: Path):
+    """Parse a JSON file with orjson when available (C parser, reads bytes)."""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with open(path) as f:
+        return json.load(f)
 
 
 @lru_cache(maxsize=32)
@@ -45,18 +95,18 @@ def _load_kern_wells() -> List[Dict]:
         MONITORING_DIR / "kern_wells.json",
     ]:
         if candidate.exists():
-            with open(candidate) as f:
-                data = json.load(f)
+            data = _read_json(candidate)
             return data if isinstance(data, list) else data.get("features", [])
     return []
 
 
-def get_nearby_wells(lat: float, lng: float, radius_mi: float = 1.0) -> Dict[str, Any]:
-    """Find wells within radius_mi of a point."""
-    wells = _load_kern_wells()
-    nearby = []
-    domestic = []
+def _build_kern_well_arrays(src_path: Path) -> Tuple[np.ndarray, ...]:
+    data = _read_json(src_path)
+    wells = data if isinstance(data, list) else data.get("features", [])
 
+    lats: List[float] = []
+    lngs: List[float] = []
+    domestic: List[bool] = []
     for w in wells:
         props = w.get("properties", w) if "properties" in w else w
         wlat = props.get("latitude") or props.get("lat")
@@ -64,23 +114,57 @@ def get_nearby_wells(lat: float, lng: float, radius_mi: float = 1.0) -> Dict[str
         if wlat is None or wlng is None:
             continue
         try:
-            dist = haversine_mi(lat, lng, float(wlat), float(wlng))
+            flat, flng = float(wlat), float(wlng)
         except (ValueError, TypeError):
             continue
-        if dist <= radius_mi:
-            use = (props.get("use") or props.get("planned_use") or "").lower()
-            entry = {
-                "distance_mi": round(dist, 3),
-                "depth_ft": props.get("total_depth") or props.get("depth"),
-                "use": use,
-            }
-            nearby.append(entry)
-            if "domestic" in use:
-                domestic.append(entry)
+        lats.append(flat)
+        lngs.append(flng)
+        use = (props.get("use") or props.get("planned_use") or "").lower()
+        domestic.append("domestic" in use)
+
+    lat_arr = np.asarray(lats, dtype=np.float64)
+    lng_arr = np.asarray(lngs, dtype=np.float64)
+    lat_rad = np.radians(lat_arr)
+    return lat_arr, lng_arr, lat_rad, np.cos(lat_rad), np.asarray(domestic, dtype=bool)
+
+
+@lru_cache(maxsize=1)
+def _load_kern_well_arrays() -> Tuple[np.ndarray, ...]:
+    """
+    Structure-of-arrays view over the well cache: coordinates (with radians
+    and cosines precomputed) plus a domestic-use flag, one entry per well
+    with parseable coordinates. The arrays are pickled next to the source
+    JSON so warm starts skip the 90k-row parse entirely.
+    """
+    for candidate in [
+        DATA_DIR / "kern_wells.json",
+        MONITORING_DIR / "kern_wells.json",
+    ]:
+        if candidate.exists():
+            return _load_or_build(
+                candidate, candidate.with_suffix(".pkl"), _build_kern_well_arrays
+            )
+    empty = np.zeros(0, dtype=np.float64)
+    return empty, empty, empty, empty, np.zeros(0, dtype=bool)
+
+
+def get_nearby_wells(lat: float, lng: float, radius_mi: float = 1.0) -> Dict[str, Any]:
+    """Find wells within radius_mi of a point."""
+    lats, lngs, _, _, domestic = _load_kern_well_arrays()
+    if lngs.size == 0:
+        within = np.zeros(0, dtype=bool)
+    else:
+        # Equirectangular approximation: at the mile-scale radii used here
+        # the error against great-circle distance is far below the
+        # coordinate precision of the well records, and the squared
+        # comparison skips the trig and sqrt of a full haversine pass
+        dy = (lats - lat) * 69.0
+        dx = (lngs - lng) * 69.0 * math.cos(math.radians(lat))
+        within = dy * dy + dx * dx <= radius_mi * radius_mi
 
     return {
-        "total_wells_within_radius": len(nearby),
-        "domestic_wells": len(domestic),
+        "total_wells_within_radius": int(np.count_nonzero(within)),
+        "domestic_wells": int(np.count_nonzero(domestic[within])),
         "radius_mi": radius_mi,
         "source": "DWR Well Completion Reports (local cache)",
     }
@@ -89,7 +173,7 @@ def get_nearby_wells(lat: float, lng: float, radius_mi: float = 1.0) -> Dict[str
 def fetch_water_level_dwr(lat: float, lng: float, radius_m: float = 5000) -> Optional[Dict]:
     """Query DWR CASGEM/GW Elevation Points near a coordinate."""
     try:
-        resp = requests.get(DWR_CASGEM_URL, params={
+        resp = _session.get(DWR_CASGEM_URL, params={
             "where": "1=1",
             "geometry": f"{lng},{lat}",
             "geometryType": "esriGeometryPoint",
@@ -126,15 +210,25 @@ def get_well_impact_data(
     """Gather spatial data needed for well-impact analysis."""
     result: Dict[str, Any] = {}
 
+    # Kick off both DWR queries in parallel, then fill in the (fast, local)
+    # nearby-well counts while they are in flight
+    seller_future = buyer_future = None
     if seller_lat and seller_lng:
-        result["seller_nearby_wells"] = get_nearby_wells(seller_lat, seller_lng)
-        wl = fetch_water_level_dwr(seller_lat, seller_lng)
-        if wl:
-            result["seller_dwr_water_level"] = wl
+        seller_future = _FETCH_POOL.submit(fetch_water_level_dwr, seller_lat, seller_lng)
+    if buyer_lat and buyer_lng:
+        buyer_future = _FETCH_POOL.submit(fetch_water_level_dwr, buyer_lat, buyer_lng)
 
+    if seller_lat and seller_lng:
+        result["seller_nearby_wells"] = get_nearby_wells(seller_lat, seller_lng)
     if buyer_lat and buyer_lng:
         result["buyer_nearby_wells"] = get_nearby_wells(buyer_lat, buyer_lng)
-        wl = fetch_water_level_dwr(buyer_lat, buyer_lng)
+
+    if seller_future is not None:
+        wl = seller_future.result()
+        if wl:
+            result["seller_dwr_water_level"] = wl
+    if buyer_future is not None:
+        wl = buyer_future.result()
         if wl:
             result["buyer_dwr_water_level"] = wl
 
@@ -1,16 +1,36 @@
-"""Pipeline stage modules."""
+"""Pipeline stage modules.
 
-from . import (
-    s1_intake,
-    s2_allocation,
-    s3_gsp_compliance,
-    s4_well_impact,
-    s5_basin_health,
-    s6_cross_gsa,
-    s7_decision,
-    sw1_intake,
-    sw2_rights_verification,
-    sw3_no_injury,
-    sw4_environmental,
-    sw5_conveyance,
-)
+Stage modules load lazily (PEP 562): `services.stages.s4_well_impact`
+and `from services.stages import s4_well_impact` both work as before,
+but a worker only pays the import cost of the stages it actually runs —
+several stages pull in requests/NumPy at import time.
+"""
+
+import importlib
+
+_STAGES = frozenset({
+    "s1_intake",
+    "s2_allocation",
+    "s3_gsp_compliance",
+    "s4_well_impact",
+    "s5_basin_health",
+    "s6_cross_gsa",
+    "s7_decision",
+    "sw1_intake",
+    "sw2_rights_verification",
+    "sw3_no_injury",
+    "sw4_environmental",
+    "sw5_conveyance",
+})
+
+
+def __getattr__(name):
+    if name in _STAGES:
+        mod = importlib.import_module(f".{name}", __name__)
+        globals()[name] = mod
+        return mod
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | _STAGES)
@@ -2,8 +2,9 @@
 Base types for transfer pipeline stages.
 """
 
+import os
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 
 @dataclass
@@ -19,18 +20,49 @@ class StageResult:
     monitoring: List[str] = field(default_factory=list)
 
 
-ENTITY_TYPES = [
+# Frozen so Stage 1 membership checks are O(1); ordered copies kept for
+# display/iteration
+ENTITY_TYPES_SEQ = (
     "farmer", "water_district", "municipality", "water_bank",
     "industrial", "gsa", "developer", "environmental",
-]
+)
+ENTITY_TYPES = frozenset(ENTITY_TYPES_SEQ)
 
-TRANSFER_TYPES = ["direct", "in_lieu", "banked"]
+TRANSFER_TYPES = ("direct", "in_lieu", "banked")
 
 ALLOWED_TRANSFER_TYPES = {
-    "direct": {"farmer", "water_district", "municipality", "water_bank",
-               "industrial", "gsa", "developer", "environmental"},
-    "in_lieu": {"farmer", "water_district", "municipality", "water_bank",
-                "gsa", "industrial"},
-    "banked": {"farmer", "water_district", "municipality", "water_bank",
-               "industrial", "developer", "environmental"},
+    "direct": frozenset({"farmer", "water_district", "municipality", "water_bank",
+                         "industrial", "gsa", "developer", "environmental"}),
+    "in_lieu": frozenset({"farmer", "water_district", "municipality", "water_bank",
+                          "gsa", "industrial"}),
+    "banked": frozenset({"farmer", "water_district", "municipality", "water_bank",
+                         "industrial", "developer", "environmental"}),
 }
+
+
+def run_many(
+    stage_run: Callable[..., StageResult],
+    records: List[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]],
+    max_workers: Optional[int] = None,
+) -> List[StageResult]:
+    """
+    Fan a stage's run() over a batch of (seller, buyer, transfer) triples
+    across worker processes. The stage runners are pure CPU and hold the
+    GIL, so a thread pool cannot parallelize them — processes can.
+
+    Worth it only for portfolio-scale batches: each worker pays fork and
+    pickling costs, so for small batches a plain loop (or a stage's own
+    columnar run_batch, where it exists) wins. `stage_run` must be a
+    module-level callable so it pickles.
+    """
+    if not records:
+        return []
+    workers = max_workers or os.cpu_count() or 1
+    # Deferred so single-record pipeline runs never pay the futures import
+    from concurrent.futures import ProcessPoolExecutor
+
+    sellers, buyers, transfers = zip(*records)
+    chunksize = max(1, len(records) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(stage_run, sellers, buyers, transfers,
+                             chunksize=chunksize))
\ No newline at end of file
@@ -15,9 +15,14 @@ def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any])
     risk_flags = []
     data = {}
 
-    seller_type = seller.get("entity_type", "")
-    buyer_type = buyer.get("entity_type", "")
-    ttype = transfer.get("transfer_type", "direct")
+    # Bind the dict getters once — this stage runs on every submission
+    sget = seller.get
+    bget = buyer.get
+    tget = transfer.get
+
+    seller_type = sget("entity_type", "")
+    buyer_type = bget("entity_type", "")
+    ttype = tget("transfer_type", "direct")
 
     # Validate entity types
     if seller_type not in ENTITY_TYPES:
@@ -32,7 +37,7 @@ def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any])
         )
 
     # Validate transfer type allowed for these entities
-    allowed = ALLOWED_TRANSFER_TYPES.get(ttype, set())
+    allowed = ALLOWED_TRANSFER_TYPES.get(ttype, frozenset())
     if buyer_type not in allowed:
         return StageResult(
             stage=STAGE_NAME, passed=False, score=0.0, finding="FAIL",
@@ -40,7 +45,7 @@ def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any])
         )
 
     # Validate basic data
-    qty = transfer.get("quantity_af", 0)
+    qty = tget("quantity_af", 0)
     if qty <= 0:
         return StageResult(
             stage=STAGE_NAME, passed=False, score=0.0, finding="FAIL",
@@ -53,8 +58,8 @@ def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any])
     data["quantity_af"] = qty
 
     # Check basin info
-    seller_basin = seller.get("basin", "")
-    buyer_basin = buyer.get("basin", "")
+    seller_basin = sget("basin", "")
+    buyer_basin = bget("basin", "")
     if not seller_basin:
         risk_flags.append("Seller basin not specified")
     if not buyer_basin:
@@ -65,25 +70,25 @@ def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any])
     data["same_basin"] = seller_basin.lower() == buyer_basin.lower() if seller_basin and buyer_basin else None
 
     # Check GSA info
-    seller_gsa = seller.get("gsa", "")
-    buyer_gsa = buyer.get("gsa", "")
+    seller_gsa = sget("gsa", "")
+    buyer_gsa = bget("gsa", "")
     data["seller_gsa"] = seller_gsa
     data["buyer_gsa"] = buyer_gsa
 
     # Extraction method
-    method = seller.get("extraction_method", "")
+    method = sget("extraction_method", "")
     if method == "self_reported":
         risk_flags.append("Seller uses self-reported extraction — metering recommended")
         conditions.append("Install totalizing flow meter within 90 days (GSP requirement)")
 
     # Check allocation > 0
-    alloc = seller.get("allocation_af", 0)
+    alloc = sget("allocation_af", 0)
     if alloc <= 0 and ttype == "direct":
         risk_flags.append("Seller has no allocation on record")
 
     # Banked water checks
     if ttype == "banked":
-        banked = seller.get("banked_balance_af", 0)
+        banked = sget("banked_balance_af", 0)
         if banked <= 0:
             return StageResult(
                 stage=STAGE_NAME, passed=False, score=0.0, finding="FAIL",
@@ -15,12 +15,16 @@ def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any])
     risk_flags = []
     data = {}
 
-    qty = transfer.get("quantity_af", 0)
-    ttype = transfer.get("transfer_type", "direct")
+    # Bind the dict getters once — this stage runs on every submission
+    sget = seller.get
+    tget = transfer.get
 
-    alloc = seller.get("allocation_af", 0)
-    used = seller.get("used_af", 0)
-    banked = seller.get("banked_balance_af", 0)
+    qty = tget("quantity_af", 0)
+    ttype = tget("transfer_type", "direct")
+
+    alloc = sget("allocation_af", 0)
+    used = sget("used_af", 0)
+    banked = sget("banked_balance_af", 0)
 
     data["allocation_af"] = alloc
     data["used_af"] = used
@@ -48,6 +52,9 @@ def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any])
             data=data,
         )
 
+    # Only the pass path reaches here, so the overage branch doubles as the
+    # score base instead of re-testing qty > available during scoring
+    score = 1.0
     if qty > available:
         overage_pct = ((qty - available) / available * 100) if available > 0 else 100
         risk_flags.append(
@@ -55,6 +62,7 @@ def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any])
             f"(overage: {overage_pct:.0f}%)"
         )
         data["overage_pct"] = round(overage_pct, 1)
+        score = max(0.2, available / qty) if qty > 0 else 0.2
 
     utilization = used / alloc if alloc > 0 else 0
     data["utilization_pct"] = round(utilization * 100, 1)
@@ -65,7 +73,7 @@ def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any])
         )
 
     # Seller entity-specific checks
-    seller_type = seller.get("entity_type", "")
+    seller_type = sget("entity_type", "")
     if seller_type == "water_bank":
         conditions.append(
             "Water bank must provide current accounting statement "
@@ -77,9 +85,6 @@ def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any])
             "impact public water supply reliability"
         )
 
-    score = 1.0
-    if qty > available:
-        score = max(0.2, available / qty) if qty > 0 else 0.2
     score -= 0.05 * len(risk_flags)
     score = max(0.1, score)
 
@@ -23,60 +23,133 @@ This replaces the previous Kern-County-only hardcoded thresholds.
 
 import csv
 import logging
-import math
+import pickle
+import sys
 from pathlib import Path
+
+import numpy as np
 from typing import Any, Dict, List, Optional, Tuple
 from functools import lru_cache
 
 from .base import StageResult
+from ..geo_kernels import haversine_mi as _haversine_mi, haversine_mi_arr_pre
 
 logger = logging.getLogger(__name__)
 STAGE_NAME = "gsp_compliance"
 
 DATA_DIR = Path(__file__).parent.parent.parent / "data"
 
+# Sustainability indicator bit positions (packed per site into one int
+# instead of a six-key dict)
+IND_GW_LEVELS = 1
+IND_GW_STORAGE = 2
+IND_SEAWATER = 4
+IND_WATER_QUALITY = 8
+IND_SUBSIDENCE = 16
+IND_ISW = 32
+
 
 # ══════════════════════════════════════════════════════════════
 #  Load real DWR GSP monitoring sites and thresholds
 # ══════════════════════════════════════════════════════════════
 
+def _load_or_build(src_path: Path, pkl_path: Path, builder, version: int = 1):
+    """
+    Load a pickled representation of a parsed CSV, rebuilding when the
+    source is newer than the pickle, the payload format version changed,
+    or the pickle is missing/corrupt. The pickle write is best-effort — a
+    read-only data dir just means the CSV parse happens on every cold
+    start, as before.
+    """
+    try:
+        if pkl_path.exists() and pkl_path.stat().st_mtime >= src_path.stat().st_mtime:
+            with open(pkl_path, "rb") as f:
+                payload = pickle.load(f)
+            if isinstance(payload, tuple) and len(payload) == 2 and payload[0] == version:
+                return payload[1]
+    except Exception as exc:
+        logger.warning("Ignoring stale/corrupt pickle cache %s: %s", pkl_path, exc)
+
+    result = builder(src_path)
+    try:
+        with open(pkl_path, "wb") as f:
+            pickle.dump((version, result), f, protocol=5)
+    except OSError as exc:
+        logger.warning("Could not write pickle cache %s: %s", pkl_path, exc)
+    return result
+
+
 @lru_cache(maxsize=1)
 def _load_monitoring_sites() -> Dict[str, Dict]:
-    """Load all monitoring sites keyed by EWM_ID."""
+    """Load all monitoring sites keyed by EWM_ID, pickle-cached on disk."""
     path = DATA_DIR / "gsp_monitoring_sites.csv"
     if not path.exists():
         logger.warning("GSP monitoring sites CSV not found: %s", path)
         return {}
+    return _load_or_build(path, path.with_suffix(".pkl"), _parse_monitoring_sites,
+                          version=2)
+
+
+def _column_getter(header: List[str], *names: str):
+    """
+    Build a row accessor for the first of `names` present in the header.
+    csv.reader hands back plain lists, so fields are fetched by position
+    instead of through a per-row dict like DictReader builds.
+    """
+    for name in names:
+        if name in header:
+            i = header.index(name)
+            return lambda row: row[i] if i < len(row) else ""
+    return lambda row: ""
+
 
+def _parse_monitoring_sites(path: Path) -> Dict[str, Dict]:
     sites = {}
     try:
-        with open(path, encoding="utf-8", errors="replace") as f:
-            reader = csv.DictReader(f)
+        with open(path, encoding="utf-8", errors="replace", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            g_ewm = _column_getter(header, "EWM_ID")
+            g_name = _column_getter(header, "LOCAL_SITE_NAME")
+            g_basin = _column_getter(header, "BASIN_NAME")
+            g_subbasin = _column_getter(header, "SUBBASIN_N")
+            g_basin_no = _column_getter(header, "BASIN_SUBB")
+            g_basin_id = _column_getter(header, "BASIN_ID")
+            g_gsa = _column_getter(header, "AGENCY_NAME")
+            g_gsp = _column_getter(header, "GSP_NAME")
+            g_lat = _column_getter(header, "LATITUDE")
+            g_lng = _column_getter(header, "LONGITUDE")
+            g_depth = _column_getter(header, "DEPTH")
+            g_gs_elev = _column_getter(header, "GS_ELEVATION")
+            g_county = _column_getter(header, "COUNTY")
+            g_ind = [
+                (IND_GW_LEVELS, _column_getter(header, "SUS_GROUNDWATER_LEVEL")),
+                (IND_GW_STORAGE, _column_getter(header, "SUS_GROUNDWATER_STORAGE")),
+                (IND_SEAWATER, _column_getter(header, "SUS_SEAWATER_INTRUSION")),
+                (IND_WATER_QUALITY, _column_getter(header, "SUS_WATER_QUALITY")),
+                (IND_SUBSIDENCE, _column_getter(header, "SUS_LAND_SUBSIDENCE")),
+                (IND_ISW, _column_getter(header, "SUS_INTER_SURFACE_WATER")),
+            ]
             for row in reader:
-                ewm = row.get("EWM_ID", "").strip()
+                ewm = g_ewm(row).strip()
                 if not ewm:
                     continue
                 sites[ewm] = {
                     "ewm_id": ewm,
-                    "site_name": row.get("LOCAL_SITE_NAME", ""),
-                    "basin_name": row.get("BASIN_NAME", ""),
-                    "subbasin": row.get("SUBBASIN_N", ""),
-                    "basin_number": row.get("BASIN_SUBB", "") or row.get("BASIN_ID", ""),
-                    "gsa_name": row.get("AGENCY_NAME", ""),
-                    "gsp_name": row.get("GSP_NAME", ""),
-                    "lat": _safe_float(row.get("LATITUDE")),
-                    "lng": _safe_float(row.get("LONGITUDE")),
-                    "depth_ft": _safe_float(row.get("DEPTH")),
-                    "gs_elevation_ft": _safe_float(row.get("GS_ELEVATION")),
-                    "county": row.get("COUNTY", ""),
-                    "indicators": {
-                        "gw_levels": row.get("SUS_GROUNDWATER_LEVEL", "") == "Yes",
-                        "gw_storage": row.get("SUS_GROUNDWATER_STORAGE", "") == "Yes",
-                        "seawater": row.get("SUS_SEAWATER_INTRUSION", "") == "Yes",
-                        "water_quality": row.get("SUS_WATER_QUALITY", "") == "Yes",
-                        "subsidence": row.get("SUS_LAND_SUBSIDENCE", "") == "Yes",
-                        "isw": row.get("SUS_INTER_SURFACE_WATER", "") == "Yes",
-                    },
+                    "site_name": g_name(row),
+                    "basin_name": g_basin(row),
+                    "subbasin": g_subbasin(row),
+                    "basin_number": g_basin_no(row) or g_basin_id(row),
+                    "gsa_name": g_gsa(row),
+                    "gsp_name": g_gsp(row),
+                    "lat": _safe_float(g_lat(row)),
+                    "lng": _safe_float(g_lng(row)),
+                    "depth_ft": _safe_float(g_depth(row)),
+                    "gs_elevation_ft": _safe_float(g_gs_elev(row)),
+                    "county": g_county(row),
+                    "indicator_bits": sum(
+                        bit for bit, getter in g_ind if getter(row) == "Yes"
+                    ),
                 }
         logger.info("Loaded %d GSP monitoring sites", len(sites))
     except Exception as exc:
@@ -87,29 +160,46 @@ def _load_monitoring_sites() -> Dict[str, Dict]:
 @lru_cache(maxsize=1)
 def _load_thresholds() -> Dict[str, Dict[str, float]]:
     """
-    Load SMC thresholds keyed by EWM_ID.
+    Load SMC thresholds keyed by EWM_ID, pickle-cached on disk.
     Returns {ewm_id: {"minimum_threshold": val, "measurable_objective": val, ...}}
     """
     path = DATA_DIR / "gsp_smc_thresholds.csv"
     if not path.exists():
         logger.warning("GSP SMC thresholds CSV not found: %s", path)
         return {}
+    return _load_or_build(path, path.with_suffix(".pkl"), _parse_thresholds,
+                          version=2)
 
+
+# The only measurement types the stage ever reads; rows carrying interim
+# milestones etc. are skipped at parse time. sys.intern keeps one shared
+# key object across the ~3k per-site dicts.
+_WANTED_MEASUREMENT_TYPES = {
+    sys.intern("minimum_threshold"),
+    sys.intern("measurable_objective"),
+}
+
+
+def _parse_thresholds(path: Path) -> Dict[str, Dict[str, float]]:
     result: Dict[str, Dict[str, float]] = {}
     try:
-        with open(path, encoding="utf-8", errors="replace") as f:
-            reader = csv.DictReader(f)
+        with open(path, encoding="utf-8", errors="replace", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            g_ewm = _column_getter(header, "EWM_ID")
+            g_mtype = _column_getter(header, "MEASUREMENT_TYPE")
+            g_val = _column_getter(header, "DATA_VALUE")
             for row in reader:
-                ewm = row.get("EWM_ID", "").strip()
+                ewm = g_ewm(row).strip()
                 if not ewm:
                     continue
-                mtype = (row.get("MEASUREMENT_TYPE") or "").strip().lower().replace(" ", "_")
-                val = _safe_float(row.get("DATA_VALUE"))
+                mtype = g_mtype(row).strip().lower().replace(" ", "_")
+                if mtype not in _WANTED_MEASUREMENT_TYPES:
+                    continue
+                val = _safe_float(g_val(row))
                 if val is None:
                     continue
-                if ewm not in result:
-                    result[ewm] = {}
-                result[ewm][mtype] = val
+                result.setdefault(ewm, {})[sys.intern(mtype)] = val
         logger.info("Loaded SMC thresholds for %d sites", len(result))
     except Exception as exc:
         logger.warning("Failed to load SMC thresholds: %s", exc)
@@ -125,44 +215,124 @@ def _safe_float(v) -> Optional[float]:
         return None
 
 
-def _haversine_mi(lat1, lon1, lat2, lon2):
-    R = 3958.8
-    dlat = math.radians(lat2 - lat1)
-    dlon = math.radians(lon2 - lon1)
-    a = (math.sin(dlat / 2) ** 2 +
-         math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) *
-         math.sin(dlon / 2) ** 2)
-    return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-
-
 # ══════════════════════════════════════════════════════════════
 #  Find monitoring sites for a basin/location
 # ══════════════════════════════════════════════════════════════
 
+@lru_cache(maxsize=1)
+def _site_coord_arrays() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Site coordinates as arrays parallel to site insertion order, with
+    radians and cosines precomputed once: (lngs, lat_rad, cos_lat).
+    Sites without coordinates hold NaN.
+    """
+    sites = _load_monitoring_sites()
+    lats = np.array([s.get("lat") or np.nan for s in sites.values()],
+                    dtype=np.float64)
+    lngs = np.array([s.get("lng") or np.nan for s in sites.values()],
+                    dtype=np.float64)
+    lat_rad = np.radians(lats)
+    return lngs, lat_rad, np.cos(lat_rad)
+
+
+@lru_cache(maxsize=1)
+def _basin_site_index() -> Dict[str, Tuple[str, ...]]:
+    """
+    Inverted index: lowercased basin/subbasin token → EWM_IDs of the sites
+    whose basin string contains it. Built once so queries touch only the
+    handful of sites sharing a token instead of scanning all ~7600.
+    """
+    index: Dict[str, List[str]] = {}
+    for ewm_id, site in _load_monitoring_sites().items():
+        site_basin = (site.get("basin_name", "") + " " + site.get("subbasin", "")).lower()
+        for token in set(site_basin.split()):
+            index.setdefault(token, []).append(ewm_id)
+    return {token: tuple(ids) for token, ids in index.items()}
+
+
+def _candidate_site_ids(basin_lower: str) -> Optional[set]:
+    """
+    Union the posting lists of every indexed token a query word falls inside.
+    Query words are substring-matched against tokens (not equality) so the
+    candidates are a superset of the sites the full predicate accepts.
+    Returns None when the query has no usable words, meaning caller must
+    fall back to a full scan.
+    """
+    words = [w for w in basin_lower.split() if len(w) > 3]
+    if not words:
+        return None
+    index = _basin_site_index()
+    candidates: set = set()
+    for word in words:
+        for token, ewm_ids in index.items():
+            if word in token:
+                candidates.update(ewm_ids)
+    return candidates
+
+
 def _find_basin_sites(
     basin: str,
     lat: Optional[float] = None,
     lng: Optional[float] = None,
 ) -> List[Dict]:
-    """Find GSP monitoring sites matching a basin name, sorted by proximity."""
+    """
+    Find GSP monitoring sites matching a basin name. With coordinates, the
+    five nearest sites lead the list in distance order and carry a
+    `distance_mi` field; ordering beyond those five is unspecified (the
+    stage only reads the nearest handful).
+    """
     sites = _load_monitoring_sites()
     basin_lower = basin.lower()
 
+    # Narrow to indexed candidates when possible; the exact predicate below
+    # still decides membership, the index only skips certain non-matches.
+    # Iteration stays in site insertion order either way so tie-breaks are
+    # unchanged.
+    candidate_ids = _candidate_site_ids(basin_lower)
+
     matches = []
-    for ewm_id, site in sites.items():
+    match_rows = []
+    for row, (ewm_id, site) in enumerate(sites.items()):
+        if candidate_ids is not None and ewm_id not in candidate_ids:
+            continue
         site_basin = (site.get("basin_name", "") + " " + site.get("subbasin", "")).lower()
         if basin_lower in site_basin or any(
             word in site_basin for word in basin_lower.split() if len(word) > 3
         ):
-            if lat and lng and site.get("lat") and site.get("lng"):
-                dist = _haversine_mi(lat, lng, site["lat"], site["lng"])
-                site = {**site, "distance_mi": round(dist, 2)}
             matches.append(site)
-
-    if lat and lng:
-        matches.sort(key=lambda s: s.get("distance_mi", 9999))
-
-    return matches
+            match_rows.append(row)
+
+    if not (lat and lng) or not matches:
+        return matches
+
+    # Vectorized haversine over the matched rows, gathering from the
+    # precomputed coordinate arrays (radians and cosines hoisted to load
+    # time); sites without coordinates sort last via +inf
+    all_lngs, all_lat_rad, all_cos_lat = _site_coord_arrays()
+    rows = np.array(match_rows, dtype=np.intp)
+    dists = haversine_mi_arr_pre(
+        lat, lng, all_lat_rad[rows], all_cos_lat[rows], all_lngs[rows]
+    )
+    dists = np.where(np.isnan(dists), np.inf, dists)
+
+    # argpartition narrows to the nearest five in O(N); ties at the rounded
+    # distance are widened in and broken by insertion order, matching what
+    # a stable full sort on the rounded values produced
+    rounded = np.round(dists, 2)
+    k = min(5, len(matches))
+    kth = np.partition(rounded, k - 1)[k - 1]
+    tied = np.nonzero(rounded <= kth)[0]
+    top = tied[np.argsort(rounded[tied], kind="stable")][:k]
+    top_set = set(top.tolist())
+
+    ordered = []
+    for i in top:
+        site = matches[i]
+        if np.isfinite(dists[i]):
+            site = {**site, "distance_mi": round(float(dists[i]), 2)}
+        ordered.append(site)
+    ordered.extend(s for i, s in enumerate(matches) if i not in top_set)
+    return ordered
 
 
 def _get_thresholds_for_sites(site_ewm_ids: List[str]) -> List[Dict]:
@@ -176,6 +346,80 @@ def _get_thresholds_for_sites(site_ewm_ids: List[str]) -> List[Dict]:
     return result
 
 
+@lru_cache(maxsize=1)
+def _threshold_arrays() -> Tuple[Dict[str, int], np.ndarray, np.ndarray]:
+    """
+    Thresholds as parallel arrays: EWM_ID → row index, plus MT and MO
+    columns with NaN for missing values, so averaging over the nearby
+    sites is one nanmean reduction instead of rebuilding filtered lists.
+    """
+    all_thresh = _load_thresholds()
+    idx_by_ewm = {ewm: i for i, ewm in enumerate(all_thresh)}
+    mt_arr = np.full(len(all_thresh), np.nan, dtype=np.float64)
+    mo_arr = np.full(len(all_thresh), np.nan, dtype=np.float64)
+    for ewm, t in all_thresh.items():
+        i = idx_by_ewm[ewm]
+        mt = t.get("minimum_threshold")
+        mo = t.get("measurable_objective")
+        if mt is not None:
+            mt_arr[i] = mt
+        if mo is not None:
+            mo_arr[i] = mo
+    return idx_by_ewm, mt_arr, mo_arr
+
+
+@lru_cache(maxsize=512)
+def _resolve_basin_thresholds(
+    basin: str, lat_q: Optional[float], lng_q: Optional[float],
+) -> Tuple[int, Optional[Dict], Optional[float], Optional[float], int, int, bool, bool]:
+    """
+    Site matching and threshold aggregation for one (basin, location) key,
+    memoized — the same basin and well-location combinations repeat heavily
+    across a day's submissions. Coordinates are pre-quantized to ~100 m by
+    the caller, which is well inside basin-scale threshold resolution.
+
+    Returns (n_sites, nearest-site summary, mean MT, mean MO,
+    n MT values, n threshold sites, subsidence flag, MT-is-elevation flag).
+    """
+    basin_sites = _find_basin_sites(basin, lat_q, lng_q)
+    if not basin_sites:
+        return 0, None, None, None, 0, 0, False, False
+
+    nearest = basin_sites[0]
+    nearest_summary = {
+        "ewm_id": nearest["ewm_id"],
+        "site_name": nearest.get("site_name", ""),
+        "distance_mi": nearest.get("distance_mi"),
+        "gsa_name": nearest.get("gsa_name", ""),
+        "gsp_name": nearest.get("gsp_name", ""),
+        "depth_ft": nearest.get("depth_ft"),
+        "gs_elevation_ft": nearest.get("gs_elevation_ft"),
+    }
+
+    nearby = basin_sites[:5]
+    idx_by_ewm, mt_arr, mo_arr = _threshold_arrays()
+    idxs = [idx_by_ewm[s["ewm_id"]] for s in nearby if s["ewm_id"] in idx_by_ewm]
+    n_thresh = len(idxs)
+    if idxs:
+        mt_vals = mt_arr[idxs]
+        mo_vals = mo_arr[idxs]
+        n_mt = int(np.count_nonzero(~np.isnan(mt_vals)))
+        mt = float(np.nanmean(mt_vals)) if n_mt else None
+        mo = float(np.nanmean(mo_vals)) if not np.isnan(mo_vals).all() else None
+    else:
+        n_mt, mt, mo = 0, None, None
+
+    any_subsidence = any(
+        s.get("indicator_bits", 0) & IND_SUBSIDENCE for s in nearby
+    )
+    # The reference frame of the averaged thresholds is fixed for a given
+    # (basin, location) key, so it is decided here once rather than on
+    # every submission
+    mt_is_elevation = mt is not None and mt > 0 and (mo is None or mo > 0)
+    return (len(basin_sites), nearest_summary, mt, mo,
+            n_mt, n_thresh, any_subsidence, mt_is_elevation)
+
+
 # ══════════════════════════════════════════════════════════════
 #  Main stage runner
 # ══════════════════════════════════════════════════════════════
@@ -185,6 +429,9 @@ def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any],
     conditions: List[str] = []
     risk_flags: List[str] = []
     data: Dict[str, Any] = {}
+    # Tracked as flags are appended so scoring never rescans the strings
+    violation = False
+    blocks_proceed = False
 
     basin = seller.get("basin", "")
     seller_lat = seller.get("well_lat")
@@ -193,11 +440,17 @@ def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any],
     data["basin"] = basin
 
     # ── Find real GSP monitoring sites for this basin ─────
-    basin_sites = _find_basin_sites(basin, seller_lat, seller_lng)
-    data["gsp_sites_found"] = len(basin_sites)
+    # Quantized to ~100 m so repeat submissions from the same well hit the
+    # memoized resolver
+    if seller_lat and seller_lng:
+        lat_q, lng_q = round(seller_lat, 3), round(seller_lng, 3)
+    else:
+        lat_q, lng_q = None, None
+    (n_sites, nearest, mt, mo, n_mt_values, n_thresh,
+     any_subsidence, mt_is_elevation) = _resolve_basin_thresholds(basin, lat_q, lng_q)
+    data["gsp_sites_found"] = n_sites
 
-    if basin_sites:
-        nearest = basin_sites[0]
+    if n_sites:
         data["nearest_gsp_site"] = {
             "ewm_id": nearest["ewm_id"],
             "name": nearest.get("site_name", ""),
@@ -207,23 +460,12 @@ def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any],
             "depth_ft": nearest.get("depth_ft"),
         }
 
-        # Get thresholds for nearby sites (up to 5 nearest)
-        nearby_ewm_ids = [s["ewm_id"] for s in basin_sites[:5]]
-        thresh_list = _get_thresholds_for_sites(nearby_ewm_ids)
-
-        if thresh_list:
-            # Use nearest site's thresholds, or average of nearby
-            mt_values = [t.get("minimum_threshold") for t in thresh_list if t.get("minimum_threshold") is not None]
-            mo_values = [t.get("measurable_objective") for t in thresh_list if t.get("measurable_objective") is not None]
-
-            mt = sum(mt_values) / len(mt_values) if mt_values else None
-            mo = sum(mo_values) / len(mo_values) if mo_values else None
-
+        if n_thresh:
             data["gsp_thresholds"] = {
                 "minimum_threshold_ft": round(mt, 1) if mt is not None else None,
                 "measurable_objective_ft": round(mo, 1) if mo is not None else None,
-                "sites_averaged": len(thresh_list),
-                "source": f"DWR GSP Data Portal ({len(thresh_list)} monitoring sites)",
+                "sites_averaged": n_thresh,
+                "source": f"DWR GSP Data Portal ({n_thresh} monitoring sites)",
             }
 
             # Compare seller water level against real thresholds.
@@ -234,8 +476,8 @@ def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any],
             if seller_wl is not None and mt is not None:
                 data["seller_water_level_ft"] = seller_wl
 
-                # Determine reference frame
-                mt_is_elevation = mt > 0 and (mo is None or mo > 0)
+                # Reference frame of the thresholds comes precomputed from
+                # the cached resolver
                 seller_is_depth = seller_wl < 0
 
                 if mt_is_elevation and seller_is_depth:
@@ -270,6 +512,8 @@ def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any],
 
                 if "mixed_warning" not in data.get("reference_frame", ""):
                     if compare_wl < mt:
+                        violation = True
+                        blocks_proceed = True
                         risk_flags.append(
                             f"Water level ({compare_wl:.1f} ft) is BELOW the "
                             f"Minimum Threshold ({mt:.1f} ft) per GSP — "
@@ -278,7 +522,7 @@ def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any],
                         conditions.append(
                             "Transfer may not proceed until water levels recover above "
                             f"Minimum Threshold ({mt:.1f} ft) per SGMA §10727.2(b)(1). "
-                            f"Based on {len(mt_values)} monitoring site(s) from DWR GSP data."
+                            f"Based on {n_mt_values} monitoring site(s) from DWR GSP data."
                         )
                     elif mo is not None and compare_wl < mo:
                         risk_flags.append(
@@ -318,8 +562,7 @@ def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any],
             )
 
     # ── Subsidence (flagged based on basin indicators) ────
-    if basin_sites:
-        any_subsidence = any(s.get("indicators", {}).get("subsidence") for s in basin_sites[:5])
+    if n_sites:
         data["subsidence_monitoring_active"] = any_subsidence
         if any_subsidence:
             conditions.append(
@@ -339,24 +582,24 @@ def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any],
 
     # ── Scoring ───────────────────────────────────────────
     score = 1.0
-    if any("violated" in f.lower() for f in risk_flags):
+    if violation:
         score -= 0.35
     score -= 0.08 * len(risk_flags)
     score -= 0.03 * len(conditions)
-    if not basin_sites:
+    if not n_sites:
         score -= 0.05  # penalty for no GSP data
     score = max(0.10, score)
 
-    passed = not any("may not proceed" in c.lower() for c in conditions)
+    passed = not blocks_proceed
     finding = "FAIL" if not passed else ("CONDITIONAL" if conditions else "PASS")
 
-    src = "DWR GSP Data Portal" if basin_sites else "no basin match"
+    src = "DWR GSP Data Portal" if n_sites else "no basin match"
 
     return StageResult(
         stage=STAGE_NAME, passed=passed, score=round(score, 2),
         finding=finding,
         reasoning=(
-            f"Basin: {basin}; {len(basin_sites)} GSP site(s) ({src}); "
+            f"Basin: {basin}; {n_sites} GSP site(s) ({src}); "
             f"{len(risk_flags)} risk flags"
         ),
         conditions=conditions, risk_flags=risk_flags, data=data,
@@ -25,9 +25,18 @@ References:
 
 import math
 import logging
-from typing import Any, Dict, List, Optional
+import sys
+import time
+from functools import lru_cache
+from statistics import median_low
+from typing import Any, Dict, List, Optional, Tuple
 
-import requests
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
 
 from .base import StageResult
 
@@ -38,6 +47,35 @@ STAGE_NAME = "well_impact"
 WCR_RESOURCE_ID = "e0e36524-5765-43c9-b7e1-4aaf54517e3b"
 WCR_API_URL = "https://data.cnra.ca.gov/api/3/action/datastore_search"
 
+
+@lru_cache(maxsize=1)
+def _get_session():
+    """
+    Shared session for the CKAN API — reuses the TLS connection across
+    lookups instead of handshaking per call (see spatial_data for the
+    same treatment of the DWR endpoints). Built lazily: importing
+    requests and urllib3 costs tens of ms of cold start that runs with
+    pump-test data or no coordinates never need.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    session.headers.update({
+        "Accept": "application/json",
+        "Accept-Encoding": "gzip",
+    })
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(total=2, backoff_factor=0.3),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
 # ── Regional Aquifer Parameters ───────────────────────────
 # Published estimates from USGS SIR 2006-5066, DWR Bulletin 118,
 # and Kern County Subbasin GSP 2025 hydro-stratigraphic model.
@@ -74,6 +112,10 @@ AQUIFER_PARAMS = {
     },
 }
 
+# Interned keys so lookups with repeated hcm_area values short-circuit
+# on pointer equality (see the GSP stage for the same treatment)
+AQUIFER_PARAMS = {sys.intern(k): v for k, v in AQUIFER_PARAMS.items()}
+
 DEFAULT_PARAMS = {
     "transmissivity_gpd_ft": 40_000,
     "storativity": 0.08,
@@ -84,77 +126,97 @@ DEFAULT_PARAMS = {
 
 # ── DWR Well Log Lookup ──────────────────────────────────
 
-def _fetch_dwr_well_yield(lat: float, lng: float, radius_mi: float = 2.0) -> Optional[Dict]:
-    """
-    Query DWR Well Completion Reports API for well yield / specific
-    capacity data near a location.  Returns estimated transmissivity
-    derived via Driscoll's empirical relationship when possible.
-    """
+# Well completion reports change on DWR's publication cadence, not per
+# submission, so raw API responses are cached by 0.1° coordinate bucket
+# (~7 mi) with a daily TTL — same bounded-dict pattern as the router's
+# stage cache.
+_WCR_CACHE: Dict[Tuple[float, float], Tuple[float, Optional[List[Dict]]]] = {}
+_WCR_CACHE_MAX = 512
+_WCR_CACHE_TTL = 86400.0
+
+
+def _fetch_dwr_raw(bucket_lat: float, bucket_lng: float) -> Optional[List[Dict]]:
+    """Fetch WCR records for a coordinate bucket, consulting the TTL cache."""
+    key = (bucket_lat, bucket_lng)
+    cached = _WCR_CACHE.get(key)
+    if cached is not None and time.monotonic() - cached[0] < _WCR_CACHE_TTL:
+        return cached[1]
+
+    records: Optional[List[Dict]] = None
     try:
         # DWR WCR on data.cnra.ca.gov — search by coordinates
-        resp = requests.get(WCR_API_URL, params={
+        resp = _get_session().get(WCR_API_URL, params={
             "resource_id": WCR_RESOURCE_ID,
             "limit": 20,
             "filters": f'{{"COUNTY": "Kern"}}',
         }, timeout=10)
-        if resp.status_code != 200:
-            return None
-
-        data = resp.json()
-        records = data.get("result", {}).get("records", [])
-        if not records:
-            return None
-
-        yields = []
-        specific_caps = []
-
-        for r in records:
-            # DWR WCR fields vary; look for yield and specific capacity
-            well_yield = r.get("WELL_YIELD") or r.get("TEST_YIELD_GPM")
-            sp_cap = r.get("SPECIFIC_CAPACITY") or r.get("SP_CAPACITY")
-            depth = r.get("TOTAL_DEPTH") or r.get("DEPTH_OF_WELL")
-
-            try:
-                if well_yield:
-                    yields.append(float(well_yield))
-                if sp_cap:
-                    specific_caps.append(float(sp_cap))
-            except (ValueError, TypeError):
-                continue
-
-        if not yields and not specific_caps:
-            return None
-
-        result: Dict[str, Any] = {
-            "wells_sampled": len(records),
-            "source": "DWR Well Completion Reports (CKAN API)",
-        }
+        if resp.status_code == 200:
+            records = resp.json().get("result", {}).get("records", []) or None
+    except Exception as exc:
+        logger.debug("DWR WCR yield lookup failed: %s", exc)
 
-        if specific_caps:
-            median_sc = sorted(specific_caps)[len(specific_caps) // 2]
-            # Driscoll (1986): T ≈ Sc × 2000 for unconfined (gpd/ft)
-            # Razack & Huntley (1991): T = 15.3 × Sc^0.67 (m²/day)
-            # We use Driscoll with factor 1500 as moderate estimate
-            T_est = median_sc * 1500
-            result["median_specific_capacity_gpm_ft"] = round(median_sc, 2)
-            result["estimated_T_gpd_ft"] = round(T_est, 0)
-            result["T_method"] = "Driscoll empirical (Sc × 1500)"
+    if len(_WCR_CACHE) >= _WCR_CACHE_MAX:
+        _WCR_CACHE.pop(next(iter(_WCR_CACHE)))
+    _WCR_CACHE[key] = (time.monotonic(), records)
+    return records
 
-        if yields:
-            median_yield = sorted(yields)[len(yields) // 2]
-            result["median_well_yield_gpm"] = round(median_yield, 1)
-            if not specific_caps:
-                # Rough T from yield: T ≈ yield × 100 (very approximate)
-                T_est = median_yield * 100
-                result["estimated_T_gpd_ft"] = round(T_est, 0)
-                result["T_method"] = "yield-based rough estimate (yield × 100)"
 
-        return result
+def _fetch_dwr_well_yield(lat: float, lng: float, radius_mi: float = 2.0) -> Optional[Dict]:
+    """
+    Query DWR Well Completion Reports API for well yield / specific
+    capacity data near a location.  Returns estimated transmissivity
+    derived via Driscoll's empirical relationship when possible.
+    """
+    records = _fetch_dwr_raw(round(lat, 1), round(lng, 1))
+    if not records:
+        return None
 
-    except Exception as exc:
-        logger.debug("DWR WCR yield lookup failed: %s", exc)
+    yields = []
+    specific_caps = []
+
+    for r in records:
+        # DWR WCR fields vary; look for yield and specific capacity
+        well_yield = r.get("WELL_YIELD") or r.get("TEST_YIELD_GPM")
+        sp_cap = r.get("SPECIFIC_CAPACITY") or r.get("SP_CAPACITY")
+        depth = r.get("TOTAL_DEPTH") or r.get("DEPTH_OF_WELL")
+
+        try:
+            if well_yield:
+                yields.append(float(well_yield))
+            if sp_cap:
+                specific_caps.append(float(sp_cap))
+        except (ValueError, TypeError):
+            continue
+
+    if not yields and not specific_caps:
         return None
 
+    result: Dict[str, Any] = {
+        "wells_sampled": len(records),
+        "source": "DWR Well Completion Reports (CKAN API)",
+    }
+
+    if specific_caps:
+        median_sc = median_low(specific_caps)
+        # Driscoll (1986): T ≈ Sc × 2000 for unconfined (gpd/ft)
+        # Razack & Huntley (1991): T = 15.3 × Sc^0.67 (m²/day)
+        # We use Driscoll with factor 1500 as moderate estimate
+        T_est = median_sc * 1500
+        result["median_specific_capacity_gpm_ft"] = round(median_sc, 2)
+        result["estimated_T_gpd_ft"] = round(T_est, 0)
+        result["T_method"] = "Driscoll empirical (Sc × 1500)"
+
+    if yields:
+        median_yield = median_low(yields)
+        result["median_well_yield_gpm"] = round(median_yield, 1)
+        if not specific_caps:
+            # Rough T from yield: T ≈ yield × 100 (very approximate)
+            T_est = median_yield * 100
+            result["estimated_T_gpd_ft"] = round(T_est, 0)
+            result["T_method"] = "yield-based rough estimate (yield × 100)"
+
+    return result
+
 
 def _estimate_storativity_from_depth(well_depth_ft: Optional[float], aquifer_thickness: float) -> float:
     """
@@ -175,24 +237,47 @@ def _estimate_storativity_from_depth(well_depth_ft: Optional[float], aquifer_thi
 
 # ── Theis Well Function ──────────────────────────────────
 
+# Ramanujan's factored expansion of the exponential integral. For
+# W(u) = E1(u) it reads
+#   W(u) = -γ - ln(u) + e^(-u/2) · Σ_{k≥1} u^k/(k!·2^(k-1)) · Σ_{n=0}^{⌊(k-1)/2⌋} 1/(2n+1)
+# Every term is positive, so there is none of the sign cancellation that
+# makes the classic alternating series need ~2x the terms. The k-th
+# coefficient (odd-harmonic sum over k!·2^(k-1)) is precomputed to k=15.
+_RAMANUJAN_COEFS = tuple(
+    sum(1.0 / (2 * n + 1) for n in range(0, (k - 1) // 2 + 1))
+    / (math.factorial(k) * 2 ** (k - 1))
+    for k in range(1, 16)
+)
+
+_EULER_GAMMA = 0.5772
+
+
 def _theis_W(u: float) -> float:
     """
     Theis well function W(u).
-    Uses Cooper-Jacob approximation for u < 0.05 and
-    series expansion for larger u.
+    Uses the Cooper-Jacob approximation for u < 1e-3 and Ramanujan's
+    factored series for larger u.
     """
     if u <= 0:
-        return 0
-    if u < 0.05:
-        return -0.5772 - math.log(u)
-    result = -0.5772 - math.log(u) + u
-    term = u
-    for n in range(2, 25):
-        term *= -u / n
-        result += term / n
-        if abs(term / n) < 1e-10:
+        return 0.0
+    if u < 1e-3:
+        return -_EULER_GAMMA - math.log(u)
+    if u > 8.0:
+        # Asymptotic expansion (Horner form): the factored series needs
+        # ever more terms out here, while W(u) is already below 4e-5
+        inv = 1.0 / u
+        return math.exp(-u) * inv * (
+            1.0 + inv * (-1.0 + inv * (2.0 + inv * (-6.0 + 24.0 * inv)))
+        )
+    s = 0.0
+    pow_u = 1.0
+    for coef in _RAMANUJAN_COEFS:
+        pow_u *= u
+        term = coef * pow_u
+        s += term
+        if term < 1e-12 * s:
             break
-    return max(0, result)
+    return max(0.0, -_EULER_GAMMA - math.log(u) + math.exp(-0.5 * u) * s)
 
 
 def _theis_drawdown_ft(
@@ -207,6 +292,77 @@ def _theis_drawdown_ft(
     return (Q_gpd * _theis_W(u)) / (4.0 * math.pi * T_gpd_ft)
 
 
+if numba is not None:
+    # Same optional JIT treatment the geo kernels get: the series loop runs
+    # as native code, and the compiled artifacts cache to disk
+    _theis_W = numba.njit(cache=True)(_theis_W)
+    _theis_drawdown_ft = numba.njit(cache=True)(_theis_drawdown_ft)
+
+
+def _theis_W_vec(u: np.ndarray) -> np.ndarray:
+    """
+    Vectorized Theis well function over an array of u values.
+    Same Cooper-Jacob / series split as the scalar _theis_W, evaluated
+    with whole-array arithmetic so one call covers every distance.
+    """
+    u = np.asarray(u, dtype=np.float64)
+    safe_u = np.where(u > 0, u, 1.0)
+    log_u = np.log(safe_u)
+    s = np.zeros_like(safe_u)
+    pow_u = np.ones_like(safe_u)
+    for coef in _RAMANUJAN_COEFS:
+        pow_u *= safe_u
+        s += coef * pow_u
+    series = -_EULER_GAMMA - log_u + np.exp(-0.5 * safe_u) * s
+    inv = 1.0 / safe_u
+    asymptotic = np.exp(-safe_u) * inv * (
+        1.0 + inv * (-1.0 + inv * (2.0 + inv * (-6.0 + 24.0 * inv)))
+    )
+    result = np.where(u > 8.0, asymptotic, series)
+    result = np.where(u < 1e-3, -_EULER_GAMMA - log_u, result)
+    result = np.where(u > 0, result, 0.0)
+    return np.clip(result, 0.0, None)
+
+
+def _theis_drawdown_ft_vec(
+    Q_af_yr: float, r_ft: np.ndarray, T_gpd_ft: float,
+    S: float, t_days: float = 365,
+) -> np.ndarray:
+    """Theis drawdown (ft) at an array of distances from the pumping well."""
+    r_ft = np.asarray(r_ft, dtype=np.float64)
+    if T_gpd_ft <= 0 or S <= 0 or Q_af_yr <= 0:
+        return np.zeros_like(r_ft)
+    Q_gpd = Q_af_yr * 325851.0 / 365.0
+    if t_days > 0:
+        u = (r_ft * r_ft * S) / (4.0 * T_gpd_ft * t_days)
+    else:
+        u = np.full_like(r_ft, 1e10)
+    dd = (Q_gpd * _theis_W_vec(u)) / (4.0 * math.pi * T_gpd_ft)
+    return np.where(r_ft > 0, dd, 0.0)
+
+
+def _superposition_drawdown_vec(
+    Q_af_yr: float, r_ft: np.ndarray, T: float, S: float,
+    t_days: float, recovery_frac: float = 0.0,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    _superposition_drawdown across an array of distances: one well-function
+    evaluation per time step instead of one per (distance, time step).
+    Returns (peak_ft, residual_ft) arrays rounded to 2 decimals.
+    """
+    r_ft = np.asarray(r_ft, dtype=np.float64)
+    peak = _theis_drawdown_ft_vec(Q_af_yr, r_ft, T, S, t_days)
+    residual = np.zeros_like(peak)
+    if 0.0 < recovery_frac < 1.0:
+        t_recovery = t_days * recovery_frac
+        if t_recovery > 0:
+            residual = (
+                _theis_drawdown_ft_vec(Q_af_yr, r_ft, T, S, t_days + t_recovery)
+                - _theis_drawdown_ft_vec(Q_af_yr, r_ft, T, S, t_recovery)
+            )
+    return np.round(peak, 2), np.round(residual, 2)
+
+
 def _superposition_drawdown(
     Q_af_yr: float, r_ft: float, T: float, S: float,
     t_days: float, recovery_frac: float = 0.0,
@@ -219,24 +375,45 @@ def _superposition_drawdown(
     residual = 0.0
     if recovery_frac > 0 and recovery_frac < 1.0:
         t_recovery = t_days * recovery_frac
-        if t_recovery > 0:
-            dd_extended = _theis_drawdown_ft(Q_af_yr, r_ft, T, S, t_days + t_recovery)
-            dd_recovery = _theis_drawdown_ft(Q_af_yr, r_ft, T, S, t_recovery)
-            residual = dd_extended - dd_recovery
+        if t_recovery > 0 and r_ft > 0 and T > 0 and S > 0 and Q_af_yr > 0:
+            u_recovery = (r_ft ** 2 * S) / (4.0 * T * t_recovery)
+            if u_recovery < 1e-3:
+                # Cooper-Jacob algebra: with u = C/t, W(u1) - W(u2)
+                # collapses to ln(t1/t2), so the residual needs one log
+                # instead of two full well-function evaluations
+                Q_gpd = Q_af_yr * 325851.0 / 365.0
+                residual = (Q_gpd * math.log((t_days + t_recovery) / t_recovery)
+                            ) / (4.0 * math.pi * T)
+            else:
+                dd_extended = _theis_drawdown_ft(Q_af_yr, r_ft, T, S, t_days + t_recovery)
+                dd_recovery = _theis_drawdown_ft(Q_af_yr, r_ft, T, S, t_recovery)
+                residual = dd_extended - dd_recovery
     return {"peak_ft": round(peak, 2), "residual_ft": round(residual, 2)}
 
 
+# The reporting radii and their labels never change, so both live at
+# module scope instead of being rebuilt per run
+_DIST_LABELS = ("500_ft", "1000_ft", "2640_ft_half_mi", "5280_ft_1mi")
+_FIXED_RADII_FT = np.array([500.0, 1000.0, 2640.0, 5280.0])
+
+
 # ── Main Stage Runner ────────────────────────────────────
 
 def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any],
         spatial_data: Optional[Dict] = None) -> StageResult:
+    # Bind the append methods once — same treatment the intake stages
+    # give their dict getters
     conditions: List[str] = []
     risk_flags: List[str] = []
+    cond_append = conditions.append
+    risk_append = risk_flags.append
     data: Dict[str, Any] = {}
 
     qty = transfer.get("quantity_af", 0)
     duration_days = transfer.get("duration_days", 365)
     hcm = seller.get("hcm_area", "")
+    # Resolved once — both the DWR branch and the regional fallback read it
+    regional = AQUIFER_PARAMS.get(hcm, DEFAULT_PARAMS)
 
     # ── Step 1: Determine aquifer parameters ──────────────
     param_source = "estimated_regional"
@@ -265,16 +442,15 @@ def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any],
             T = dwr_yield["estimated_T_gpd_ft"]
             S = _estimate_storativity_from_depth(
                 seller.get("well_depth_ft"),
-                AQUIFER_PARAMS.get(hcm, DEFAULT_PARAMS)["aquifer_thickness_ft"],
+                regional["aquifer_thickness_ft"],
             )
             param_source = "dwr_wcr_derived"
             data["dwr_well_yield_lookup"] = dwr_yield
         else:
             # Fall back to regional published estimates
-            params = AQUIFER_PARAMS.get(hcm, DEFAULT_PARAMS)
-            T = params["transmissivity_gpd_ft"]
-            S = params.get("storativity", 0.08)
-            param_source = f"regional_published ({params['source']})"
+            T = regional["transmissivity_gpd_ft"]
+            S = regional.get("storativity", 0.08)
+            param_source = f"regional_published ({regional['source']})"
 
     data["aquifer_parameters"] = {
         "transmissivity_gpd_ft": T,
@@ -283,35 +459,39 @@ def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any],
     }
 
     # ── Step 2: Calculate drawdown at key distances ───────
-    distances_ft = {
-        "500_ft": 500,
-        "1000_ft": 1000,
-        "2640_ft_half_mi": 2640,
-        "5280_ft_1mi": 5280,
-    }
+    # The buyer's actual distance rides in the same array, so the whole
+    # fan-out costs one vectorized well-function evaluation per time step
+    distance_mi = (spatial_data or {}).get("distance_mi")
+    if distance_mi:
+        radii_ft = np.append(_FIXED_RADII_FT, distance_mi * 5280)
+    else:
+        radii_ft = _FIXED_RADII_FT
 
-    drawdown = {}
-    for label, r_ft in distances_ft.items():
-        dd_info = _superposition_drawdown(qty, r_ft, T, S, duration_days, recovery_frac=0.5)
-        drawdown[label] = dd_info
+    peaks, residuals = _superposition_drawdown_vec(
+        qty, radii_ft, T, S, duration_days, recovery_frac=0.5
+    )
+    peaks = peaks.tolist()
+    residuals = residuals.tolist()
 
+    drawdown = {
+        label: {"peak_ft": p, "residual_ft": r}
+        for label, p, r in zip(_DIST_LABELS, peaks, residuals)
+    }
     data["theis_drawdown"] = drawdown
 
     # ── Step 3: Drawdown at actual buyer distance ─────────
-    distance_mi = (spatial_data or {}).get("distance_mi")
     if distance_mi:
-        buyer_r_ft = distance_mi * 5280
-        buyer_dd = _superposition_drawdown(qty, buyer_r_ft, T, S, duration_days, recovery_frac=0.5)
+        buyer_dd = {"peak_ft": peaks[-1], "residual_ft": residuals[-1]}
         data["buyer_distance_mi"] = distance_mi
         data["buyer_drawdown"] = buyer_dd
 
         if buyer_dd["peak_ft"] > 5:
-            risk_flags.append(
+            risk_append(
                 f"Estimated peak drawdown at buyer well: {buyer_dd['peak_ft']:.1f} ft "
                 f"at {distance_mi:.1f} mi — significant impact"
             )
         elif buyer_dd["peak_ft"] > 1:
-            risk_flags.append(
+            risk_append(
                 f"Moderate estimated drawdown at buyer well: {buyer_dd['peak_ft']:.1f} ft"
             )
 
@@ -325,11 +505,11 @@ def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any],
     dd_1mi = drawdown.get("5280_ft_1mi", {}).get("peak_ft", 0)
 
     if domestic_count > 0 and dd_1mi > 2:
-        risk_flags.append(
+        risk_append(
             f"{domestic_count} domestic well(s) within 1 mile; "
             f"peak drawdown {dd_1mi:.1f} ft could impact shallow domestic wells"
         )
-        conditions.append(
+        cond_append(
             "Monitoring of domestic wells within 1 mile required during and "
             "after transfer. If drawdown exceeds 5 ft at any domestic well, "
             "pumping must be curtailed."
@@ -341,21 +521,21 @@ def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any],
     elif "dwr_wcr" in param_source:
         data["parameter_confidence"] = "moderate"
         if qty > 500:
-            conditions.append(
+            cond_append(
                 "Aquifer parameters derived from DWR well logs (specific capacity). "
                 "For transfers > 500 AF, site-specific pump test recommended."
             )
     else:
         data["parameter_confidence"] = "low"
         if qty > 200:
-            conditions.append(
+            cond_append(
                 "Aquifer parameters are regional estimates from published studies. "
                 "Site-specific pump test (24-hr constant-rate test) recommended "
                 "for transfers exceeding 200 AF to improve drawdown accuracy."
             )
 
     if dd_1mi > 10:
-        conditions.append(
+        cond_append(
             "Significant drawdown predicted — require site-specific pump test "
             "and detailed 3D groundwater model before approval"
         )
@@ -368,20 +548,20 @@ def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any],
         }
 
     # ── Score ─────────────────────────────────────────────
-    score = 1.0
-    if dd_1mi > 10:
-        score -= 0.30
-    elif dd_1mi > 5:
-        score -= 0.20
-    elif dd_1mi > 2:
-        score -= 0.10
-    if domestic_count > 5:
-        score -= 0.15
-    elif domestic_count > 0:
-        score -= 0.05
-    if "regional" in param_source and qty > 1000:
-        score -= 0.05  # penalize low-confidence for large transfers
-    score -= 0.03 * len(risk_flags)
+    # Every threshold is a constant, so the if/elif ladder collapses to
+    # straight arithmetic over the exclusive bands — same penalties, no
+    # branches (and it vectorizes as-is in columnar form)
+    score = (
+        1.0
+        - 0.30 * (dd_1mi > 10)
+        - 0.20 * (5 < dd_1mi <= 10)
+        - 0.10 * (2 < dd_1mi <= 5)
+        - 0.15 * (domestic_count > 5)
+        - 0.05 * (0 < domestic_count <= 5)
+        # penalize low-confidence parameters for large transfers
+        - 0.05 * ("regional" in param_source and qty > 1000)
+        - 0.03 * len(risk_flags)
+    )
     score = max(0.15, score)
 
     passed = dd_1mi < 20
@@ -5,9 +5,17 @@ Evaluates the overall health of the source basin including
 critically overdrafted status, storage trends, and subsidence.
 """
 
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
 from .base import StageResult
 
+try:
+    import ahocorasick  # pyahocorasick
+except ImportError:
+    ahocorasick = None
+
 STAGE_NAME = "basin_health"
 
 CRITICALLY_OVERDRAFTED_BASINS = [
@@ -21,11 +29,33 @@ CRITICALLY_OVERDRAFTED_BASINS = [
     "Tracy Subbasin",
 ]
 
+# Lowercased once at import — the check runs per submission and was
+# re-lowering all 21 names on every call
+_COD_LOWER = tuple(b.lower() for b in CRITICALLY_OVERDRAFTED_BASINS)
+_COD_SET = frozenset(_COD_LOWER)
+
+# One Aho-Corasick automaton over the 21 names: a single pass over the
+# query finds any embedded COD name instead of 21 substring searches
+# (same optional treatment the policy engine gives its keyword scan)
+_COD_AUTOMATON = None
+if ahocorasick is not None:
+    _COD_AUTOMATON = ahocorasick.Automaton()
+    for _b in _COD_LOWER:
+        _COD_AUTOMATON.add_word(_b, _b)
+    _COD_AUTOMATON.make_automaton()
+
 
 def _is_critically_overdrafted(basin: str) -> bool:
     basin_lower = basin.lower()
-    return any(b.lower() in basin_lower or basin_lower in b.lower()
-               for b in CRITICALLY_OVERDRAFTED_BASINS)
+    if basin_lower in _COD_SET:
+        return True
+    if _COD_AUTOMATON is not None:
+        for _ in _COD_AUTOMATON.iter(basin_lower):
+            return True
+        # The automaton only covers "COD name inside the query"; the
+        # reverse direction (query inside a COD name) still needs the scan
+        return any(basin_lower in b for b in _COD_LOWER)
+    return any(b in basin_lower or basin_lower in b for b in _COD_LOWER)
 
 
 def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any]) -> StageResult:
@@ -110,3 +140,105 @@ def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any])
         ),
         conditions=conditions, risk_flags=risk_flags, data=data,
     )
+
+
+def run_batch(
+    records: List[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]],
+) -> List[StageResult]:
+    """
+    Columnar evaluation of the basin-health stage over a batch of
+    (seller, buyer, transfer) triples — the same shape batch_route takes.
+
+    The overdraft predicate runs once per unique basin instead of once
+    per record, and the scoring arithmetic is whole-array NumPy over the
+    batch. Each record gets the exact StageResult run() would produce;
+    only the flag/condition strings are still formatted per row, and
+    only for rows that trip them.
+    """
+    n = len(records)
+    if n == 0:
+        return []
+
+    basins = [s.get("basin", "") for s, _, _ in records]
+    cod_by_basin = {b: _is_critically_overdrafted(b) for b in set(basins)}
+    is_cod = np.fromiter((cod_by_basin[b] for b in basins), dtype=bool, count=n)
+
+    srcs = [t.get("source_basin", s.get("basin", "")) for s, _, t in records]
+    dsts = [t.get("destination_basin", b.get("basin", "")) for _, b, t in records]
+    is_export = np.fromiter(
+        (bool(sb and db) and sb.lower() != db.lower() for sb, db in zip(srcs, dsts)),
+        dtype=bool, count=n,
+    )
+
+    wls = [s.get("water_level_ft") for s, _, _ in records]
+    wl_arr = np.array([np.nan if w is None else w for w in wls], dtype=np.float64)
+    qtys = [t.get("quantity_af", 0) for _, _, t in records]
+    qty_arr = np.asarray(qtys, dtype=np.float64)
+
+    cod_export = is_cod & is_export
+    wl_deep = wl_arr < -150          # NaN compares false, matching the None guard
+    wl_mid = (wl_arr < -100) & ~wl_deep
+    big_cod = (qty_arr > 5000) & is_cod
+
+    n_flags = (is_cod.astype(np.int64) + cod_export + wl_deep + wl_mid + big_cod)
+    score = 1.0 - 0.15 * is_cod - 0.20 * cod_export - 0.15 * wl_deep - 0.05 * n_flags
+    score = np.maximum(0.10, score)
+    passed = ~(cod_export & (qty_arr > 10000))
+
+    results: List[StageResult] = []
+    for i in range(n):
+        basin = basins[i]
+        conditions = []
+        risk_flags = []
+        data: Dict[str, Any] = {
+            "basin": basin,
+            "critically_overdrafted": bool(is_cod[i]),
+            "source": "DWR Bulletin 118, 2019 Basin Prioritization",
+            "is_export": bool(is_export[i]),
+        }
+        if is_cod[i]:
+            risk_flags.append(
+                f"Basin '{basin}' is Critically Overdrafted per DWR Bulletin 118"
+            )
+            conditions.append(
+                "Transfer from critically overdrafted basin requires demonstration "
+                "that extraction will not worsen overdraft conditions"
+            )
+        if cod_export[i]:
+            risk_flags.append(
+                "Groundwater export from critically overdrafted basin — "
+                "heightened scrutiny required per SGMA §10726.4(a)(2)"
+            )
+            conditions.append(
+                "GSA board approval required for export from critically overdrafted basin"
+            )
+        if wls[i] is not None:
+            data["current_water_level_ft"] = wls[i]
+            if wl_deep[i]:
+                risk_flags.append(
+                    f"Very deep water level ({wls[i]} ft) indicates severe depletion"
+                )
+            elif wl_mid[i]:
+                risk_flags.append(
+                    f"Deep water level ({wls[i]} ft) below measurable objective"
+                )
+        data["transfer_qty_af"] = qtys[i]
+        if big_cod[i]:
+            risk_flags.append(
+                f"Large transfer ({qtys[i]:,.0f} AF) from critically overdrafted basin "
+                "— requires detailed basin impact analysis"
+            )
+
+        p = bool(passed[i])
+        finding = "FAIL" if not p else ("CONDITIONAL" if conditions else "PASS")
+        results.append(StageResult(
+            stage=STAGE_NAME, passed=p, score=round(float(score[i]), 2),
+            finding=finding,
+            reasoning=(
+                f"Basin: {basin}; "
+                f"{'Critically Overdrafted' if is_cod[i] else 'Not Critically Overdrafted'}; "
+                f"{'Export' if is_export[i] else 'Intra-basin'}"
+            ),
+            conditions=conditions, risk_flags=risk_flags, data=data,
+        ))
+    return results
@@ -10,10 +10,25 @@ from .base import StageResult
 
 STAGE_NAME = "cross_gsa"
 
+# GSAs party to the Kern County Subbasin Coordination Agreement
+KERN_COORD_GSAS = (
+    "rosedale-rio bravo", "semitropic", "kern county water agency",
+    "olcese", "north kern", "buena vista",
+)
+
+
+def _in_kern_agreement(gsa_lower: str) -> bool:
+    for k in KERN_COORD_GSAS:
+        if k in gsa_lower:
+            return True
+    return False
+
 
 def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any]) -> StageResult:
     conditions = []
     risk_flags = []
+    cond_append = conditions.append
+    risk_append = risk_flags.append
     data = {}
 
     src_gsa = transfer.get("source_gsa", seller.get("gsa", ""))
@@ -23,7 +38,7 @@ def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any])
     data["destination_gsa"] = dst_gsa
 
     if not src_gsa or not dst_gsa:
-        risk_flags.append("GSA information incomplete — cannot verify cross-GSA status")
+        risk_append("GSA information incomplete — cannot verify cross-GSA status")
         return StageResult(
             stage=STAGE_NAME, passed=True, score=0.70, finding="CONDITIONAL",
             reasoning="GSA info missing; assuming potential cross-GSA transfer",
@@ -35,29 +50,23 @@ def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any])
     data["is_cross_gsa"] = is_cross_gsa
 
     if is_cross_gsa:
-        risk_flags.append(
+        risk_append(
             f"Cross-GSA transfer: {src_gsa} → {dst_gsa}"
         )
-        conditions.append(
+        cond_append(
             "Coordination agreement between GSAs required per SGMA §10726.4"
         )
-        conditions.append(
+        cond_append(
             "Both GSAs must verify transfer is consistent with their respective GSPs"
         )
 
-        # Check for known coordination agreements (Kern County)
-        kern_coord_gsas = {
-            "rosedale-rio bravo", "semitropic", "kern county water agency",
-            "olcese", "north kern", "buena vista",
-        }
-        src_known = any(k in src_gsa.lower() for k in kern_coord_gsas)
-        dst_known = any(k in dst_gsa.lower() for k in kern_coord_gsas)
-
-        if src_known and dst_known:
+        # Check for known coordination agreements (Kern County) — the
+        # destination lookup is skipped entirely unless the source matches
+        if _in_kern_agreement(src_gsa.lower()) and _in_kern_agreement(dst_gsa.lower()):
             data["coordination_agreement"] = "Kern County Subbasin Coordination Agreement"
             data["agreement_status"] = "Active — 2020 Coordination Agreement"
         else:
-            conditions.append(
+            cond_append(
                 "No known coordination agreement on file — "
                 "GSAs must execute agreement before transfer"
             )
@@ -4,11 +4,16 @@ Groundwater Stage 7 — Decision Synthesis
 Aggregates all stage results into a final decision with weighted scoring.
 """
 
+from operator import attrgetter
 from typing import Any, Dict, List, Optional
 from .base import StageResult
 
 STAGE_NAME = "decision"
 
+# One bound attrgetter replaces six dict hashes per StageResult; dict
+# inputs (already-serialized results) keep the .get path below
+_FIELDS = attrgetter("stage", "score", "passed", "conditions", "risk_flags", "monitoring")
+
 DEFAULT_WEIGHTS = {
     "intake_validation":  0.10,
     "allocation_check":   0.15,
@@ -29,12 +34,14 @@ def run(
     weights: Optional[Dict[str, float]] = None,
 ) -> Dict[str, Any]:
     """Synthesize a final decision from stage results."""
-    w = weights or DEFAULT_WEIGHTS
+    w_get = (weights or DEFAULT_WEIGHTS).get
 
-    all_conditions = []
-    all_risk_flags = []
-    all_monitoring = []
-    all_data = {}
+    # Insertion-ordered dicts double as ordered sets: the accumulation
+    # deduplicates as it goes instead of extending lists and rescanning
+    # them at the end
+    cond_d: Dict[str, None] = {}
+    risk_d: Dict[str, None] = {}
+    mon_d: Dict[str, None] = {}
 
     any_failed = False
     weighted_sum = 0.0
@@ -42,40 +49,44 @@ def run(
 
     stage_dicts = []
     for sr in stage_results:
-        d = sr.__dict__ if hasattr(sr, "__dict__") else sr
-        stage_dicts.append(d)
-
-        stage_name = d.get("stage", "")
-        score = d.get("score", 0)
-        passed = d.get("passed", True)
-
-        stage_weight = w.get(stage_name, 0.10)
+        if isinstance(sr, StageResult):
+            stage_dicts.append(sr.__dict__)
+            stage_name, score, passed, conds, rfs, mons = _FIELDS(sr)
+        else:
+            stage_dicts.append(sr)
+            stage_name = sr.get("stage", "")
+            score = sr.get("score", 0)
+            passed = sr.get("passed", True)
+            conds = sr.get("conditions", [])
+            rfs = sr.get("risk_flags", [])
+            mons = sr.get("monitoring", [])
+
+        stage_weight = w_get(stage_name, 0.10)
         weighted_sum += score * stage_weight
         weight_total += stage_weight
 
         if not passed:
             any_failed = True
 
-        all_conditions.extend(d.get("conditions", []))
-        all_risk_flags.extend(d.get("risk_flags", []))
-        all_monitoring.extend(d.get("monitoring", []))
+        cond_d.update(dict.fromkeys(conds))
+        risk_d.update(dict.fromkeys(rfs))
+        mon_d.update(dict.fromkeys(mons))
 
     composite = weighted_sum / weight_total if weight_total > 0 else 0.0
 
     # Decision logic
     if any_failed:
         decision = "DENIED"
-    elif composite >= 0.75 and not all_conditions:
+    elif composite >= 0.75 and not cond_d:
         decision = "APPROVED"
     elif composite >= 0.50:
         decision = "CONDITIONALLY_APPROVED"
     else:
         decision = "DENIED"
 
-    # Deduplicate
-    conditions = list(dict.fromkeys(all_conditions))
-    risk_flags = list(dict.fromkeys(all_risk_flags))
-    monitoring = list(dict.fromkeys(all_monitoring))
+    conditions = list(cond_d)
+    risk_flags = list(risk_d)
+    monitoring = list(mon_d)
 
     return {
         "decision": decision,
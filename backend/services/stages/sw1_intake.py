@@ -11,15 +11,25 @@ from .base import StageResult
 
 STAGE_NAME = "sw_intake_validation"
 
-VALID_RIGHT_TYPES = [
-    "appropriative_pre1914", "appropriative_post1914",
-    "cvp_contract", "swp_contract", "riparian",
-]
+# Per-right-type metadata, resolved with one hash lookup instead of a
+# membership scan plus separate equality checks:
+# (is_contract, is_pre1914, approver_agency, contract_label)
+_RIGHT_META = {
+    "appropriative_pre1914":  (False, True, None, None),
+    "appropriative_post1914": (False, False, None, None),
+    "cvp_contract":           (True, False, "Bureau of Reclamation", "CVP"),
+    "swp_contract":           (True, False, "DWR", "SWP"),
+    "riparian":               (False, False, None, None),
+}
+
+VALID_RIGHT_TYPES = list(_RIGHT_META)
 
 
 def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any]) -> StageResult:
     conditions = []
     risk_flags = []
+    cond_append = conditions.append
+    risk_append = risk_flags.append
     data = {}
 
     seller_type = seller.get("entity_type", "")
@@ -31,7 +41,8 @@ def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any])
     data["water_right_id"] = right_id
 
     # Validate right type
-    if right_type not in VALID_RIGHT_TYPES:
+    meta = _RIGHT_META.get(right_type)
+    if meta is None:
         return StageResult(
             stage=STAGE_NAME, passed=False, score=0.0, finding="FAIL",
             reasoning=f"Unknown water right type: '{right_type}'",
@@ -39,8 +50,7 @@ def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any])
         )
 
     # CVP/SWP contracts and pre-1914 rights don't need eWRIMS permit ID
-    is_contract = right_type in ("cvp_contract", "swp_contract")
-    is_pre1914 = right_type == "appropriative_pre1914"
+    is_contract, is_pre1914, approver_agency, contract_label = meta
     data["is_contract_transfer"] = is_contract
     data["is_pre1914"] = is_pre1914
 
@@ -74,13 +84,12 @@ def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any])
         data["contract_available_af"] = max(0, available)
 
         if qty > available:
-            risk_flags.append(
+            risk_append(
                 f"Requested {qty:,.0f} AF exceeds available contract water "
                 f"({available:,.0f} AF)"
             )
-        conditions.append(
-            f"{'Bureau of Reclamation' if right_type == 'cvp_contract' else 'DWR'} "
-            f"approval required for {'CVP' if right_type == 'cvp_contract' else 'SWP'} "
+        cond_append(
+            f"{approver_agency} approval required for {contract_label} "
             f"contract water transfer"
         )
 
@@ -89,7 +98,7 @@ def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any])
         face_value = seller.get("face_value_af", 0)
         data["face_value_af"] = face_value
         if face_value > 0 and qty > face_value:
-            risk_flags.append(
+            risk_append(
                 f"Transfer qty ({qty:,.0f} AF) exceeds face value ({face_value:,.0f} AF)"
             )
 
@@ -98,7 +107,7 @@ def run(seller: Dict[str, Any], buyer: Dict[str, Any], transfer: Dict[str, Any])
     data["duration_days"] = duration
     if duration > 365:
         data["long_term"] = True
-        conditions.append(
+        cond_append(
             "Long-term transfer (>1 year) requires SWRCB long-term change petition"
         )
 
@@ -7,9 +7,14 @@ Falls back to seller-provided data if API is unavailable.
 """
 
 import logging
-from typing import Any, Dict, Optional
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .base import StageResult
 
@@ -22,17 +27,97 @@ EWRIMS_API_URL = (
     f"?resource_id={EWRIMS_RESOURCE_ID}"
 )
 
+# Shared session with a connection pool: repeated eWRIMS lookups reuse the
+# same TLS connection instead of paying the handshake on every call, and
+# transient CKAN gateway errors get a short retry instead of an immediate
+# seller-data fallback
+_SESSION = requests.Session()
+_SESSION.headers.update({"Accept": "application/json", "Connection": "keep-alive"})
+_adapter = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=50,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+)
+_SESSION.mount("https://", _adapter)
+
+# Memo of confirmed eWRIMS hits keyed by right_id. A right's status, face
+# value, and priority date change on regulatory timescales, so API-sourced
+# records are good for a day; seller-provided fallbacks are never cached
+# because they depend on whichever seller dict made the request.
+_EWRIMS_CACHE: Dict[str, Tuple[float, Dict]] = {}
+_EWRIMS_CACHE_MAX = 4096
+_EWRIMS_CACHE_TTL = float(os.getenv("EWRIMS_CACHE_TTL", 24 * 3600))
+
+# Circuit breaker around the CKAN call. During a data.ca.gov outage every
+# lookup would otherwise burn the full timeout-plus-retries budget before
+# falling back; after _CB_FAIL_MAX consecutive failures the circuit opens
+# and lookups fall back to seller data immediately. After
+# _CB_RESET_TIMEOUT seconds one probe request is let through (half-open):
+# success closes the circuit, failure re-opens it.
+_CB_FAIL_MAX = 5
+_CB_RESET_TIMEOUT = 30.0
+_cb_lock = threading.Lock()
+_cb_state = "closed"  # "closed" | "open" | "half_open"
+_cb_fail_count = 0
+_cb_opened_at = 0.0
+
+
+def _cb_allow() -> bool:
+    """Whether an API call may go out; flips open → half-open after timeout."""
+    global _cb_state
+    with _cb_lock:
+        if _cb_state == "closed":
+            return True
+        if _cb_state == "open" and time.monotonic() - _cb_opened_at >= _CB_RESET_TIMEOUT:
+            _cb_state = "half_open"
+            return True
+        # Open within the reset window, or a half-open probe is already out
+        return False
+
+
+def _cb_record_success() -> None:
+    global _cb_state, _cb_fail_count
+    with _cb_lock:
+        if _cb_state != "closed":
+            logger.info("eWRIMS circuit closed — API recovered")
+        _cb_state = "closed"
+        _cb_fail_count = 0
+
+
+def _cb_record_failure() -> None:
+    global _cb_state, _cb_fail_count, _cb_opened_at
+    with _cb_lock:
+        _cb_fail_count += 1
+        if _cb_state == "half_open" or _cb_fail_count >= _CB_FAIL_MAX:
+            _cb_state = "open"
+            _cb_fail_count = 0
+            _cb_opened_at = time.monotonic()
+            logger.warning(
+                "eWRIMS circuit opened — failing fast for %.0fs", _CB_RESET_TIMEOUT
+            )
+
 
 def _lookup_ewrims(right_id: str, seller: Dict) -> Optional[Dict]:
     """Look up a water right in eWRIMS via CKAN API."""
+    cached = _EWRIMS_CACHE.get(right_id)
+    if cached is not None:
+        ts, rec = cached
+        if time.monotonic() - ts < _EWRIMS_CACHE_TTL:
+            # Copy so a consumer mutating its record can't poison the cache
+            return dict(rec)
+        del _EWRIMS_CACHE[right_id]
+    if not _cb_allow():
+        logger.info("eWRIMS circuit open — using seller data for %s", right_id)
+        return _from_seller(seller, "circuit_open_fallback")
     try:
-        resp = requests.get(
+        resp = _SESSION.get(
             EWRIMS_API_URL,
             params={"q": right_id, "limit": 5},
             timeout=10,
         )
         resp.raise_for_status()
         data = resp.json()
+        _cb_record_success()
         records = data.get("result", {}).get("records", [])
 
         if not records:
@@ -40,7 +125,7 @@ def _lookup_ewrims(right_id: str, seller: Dict) -> Optional[Dict]:
             return _from_seller(seller, "ewrims_no_match")
 
         rec = records[0]
-        return {
+        record = {
             "application_id": rec.get("APPLICATION_NUMBER", ""),
             "holder": rec.get("PRIMARY_OWNER", ""),
             "right_type": rec.get("WATER_RIGHT_TYPE", ""),
@@ -51,7 +136,12 @@ def _lookup_ewrims(right_id: str, seller: Dict) -> Optional[Dict]:
             "county": rec.get("COUNTY", ""),
             "source": "ewrims_api",
         }
+        if len(_EWRIMS_CACHE) >= _EWRIMS_CACHE_MAX:
+            _EWRIMS_CACHE.pop(next(iter(_EWRIMS_CACHE)))
+        _EWRIMS_CACHE[right_id] = (time.monotonic(), record)
+        return record
     except Exception as exc:
+        _cb_record_failure()
         logger.warning("eWRIMS API lookup failed for %s: %s — using seller data", right_id, exc)
         return _from_seller(seller, "seller_provided_api_fallback")
 